@@ -7,19 +7,54 @@ This module handles finding USGS LiDAR datasets that intersect with a GeoJSON bo
 
 import os
 import re
+import csv
 import json
+import time
+import pickle
 import logging
 import tempfile
 import requests
+import pandas as pd
 import geopandas as gpd
-from shapely.geometry import shape, mapping
-from typing import List, Dict, Any, Optional
+from shapely.geometry import shape, mapping, box
+from shapely.ops import unary_union
+from typing import List, Dict, Any, Optional, Tuple
+
+from .config import DEFAULT_CONFIG, get_cache_dir
 
 logger = logging.getLogger(__name__)
 
 # URL to the USGS LiDAR GeoJSON file
 USGS_LIDAR_BOUNDARIES_URL = "https://raw.githubusercontent.com/hobu/usgs-lidar/master/boundaries/resources.geojson"
 
+# Bundled GeoPackage copy of the USGS LiDAR boundaries (layer name matches the file name)
+BUNDLED_GPKG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "usgs_lidar_boundaries.gpkg"
+)
+GPKG_LAYER = "usgs_lidar_boundaries"
+
+# File names used inside the cache directory
+BOUNDARIES_CACHE_FILENAME = "resources.geojson"
+BOUNDARIES_CACHE_META_FILENAME = "resources.meta.json"
+CATALOG_CACHE_FILENAME = "catalog.pkl"
+CATALOG_PARQUET_FILENAME = "catalog.parquet"
+
+# Bumped whenever the columns derived in build_usgs_catalog() change
+CATALOG_CACHE_VERSION = 2
+
+# Pattern used to find dataset years (1990-2029) in names with underscores
+YEAR_PATTERN = r'(?:^|[^0-9])(19[9][0-9]|20[0-2][0-9])(?:$|[^0-9])'
+
+# Attribute columns written to the columnar catalog (geometry is stored as WKB)
+CATALOG_PARQUET_COLUMNS = ['name', 'url', 'year', 's3_url']
+
+# Parsed boundaries keyed by cache path, stored with the file mtime they were read at
+_parsed_boundaries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+# Catalogs keyed by boundaries cache path, stored with the file mtime they were built from
+_catalogs: Dict[str, Tuple[float, gpd.GeoDataFrame]] = {}
+
 
 def extract_year(name: str) -> Optional[int]:
     """
@@ -33,7 +68,7 @@ def extract_year(name: str) -> Optional[int]:
     """
     # Find all 4-digit numbers that could be years (1990-2025)
     # Use a pattern that works with underscores common in dataset names
-    years = re.findall(r'(?:^|[^0-9])(19[9][0-9]|20[0-2][0-9])(?:$|[^0-9])', name)
+    years = re.findall(YEAR_PATTERN, name)
     
     if years:
         # Return the first year found as an integer
@@ -41,37 +76,497 @@ def extract_year(name: str) -> Optional[int]:
     return None
 
 
-def download_usgs_boundaries() -> Optional[Dict[str, Any]]:
+def extract_years(names: pd.Series) -> pd.Series:
     """
-    Download the USGS LiDAR boundaries GeoJSON file.
+    Vectorized version of extract_year() for a whole column of dataset names.
     
+    Args:
+        names: Series of dataset names
+        
     Returns:
-        dict: Parsed GeoJSON data or None if download failed
+        Series: Extracted years as floats, NaN where no year was found
+    """
+    years = names.astype(str).str.extract(YEAR_PATTERN, expand=False)
+    return pd.to_numeric(years, errors='coerce')
+
+
+def extract_s3_buckets_from_urls(urls: pd.Series) -> pd.Series:
+    """
+    Vectorized version of extract_s3_bucket_from_url() for a column of URLs.
+    
+    Args:
+        urls: Series of dataset URLs
+        
+    Returns:
+        Series: S3 bucket URLs, None where no bucket was found
+    """
+    urls = urls.fillna('').astype(str)
+    is_s3 = urls.str.contains('amazonaws.com', regex=False)
+    
+    # https://s3-us-west-2.amazonaws.com/usgs-lidar-public/AR_Dardenelle_2011/ept.json
+    public_path = urls.str.extract(r'usgs-lidar-public/(.*?)(?:/ept\.json|\Z)', expand=False)
+    public = 'usgs-lidar-public/' + public_path
+    
+    # Other patterns of USGS LiDAR URLs
+    parts = urls.str.extract(r'amazonaws\.com/([^/]+)/([^/]+)')
+    generic = parts[0] + '/' + parts[1]
+    
+    s3_urls = public.where(public_path.notna(), generic).where(is_s3)
+    return s3_urls.astype(object).where(s3_urls.notna(), None)
+
+
+def _load_cached_boundaries(cache_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the cached boundaries file, reusing the parsed result within a process.
+    
+    Args:
+        cache_path: Path to the cached GeoJSON file
+        
+    Returns:
+        dict: Parsed GeoJSON data or None if the cache is missing or unreadable
     """
     try:
+        mtime = os.path.getmtime(cache_path)
+    except OSError:
+        return None
+    
+    cached = _parsed_boundaries.get(cache_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    try:
+        with open(cache_path, "r") as f:
+            geojson_data = json.load(f)
+    except Exception as e:
+        logger.warning(f"Could not read cached USGS LiDAR boundaries at {cache_path}: {str(e)}")
+        return None
+    
+    if geojson_data.get('type') != 'FeatureCollection':
+        logger.warning(f"Cached USGS LiDAR boundaries at {cache_path} are not a valid FeatureCollection")
+        return None
+    
+    _parsed_boundaries[cache_path] = (mtime, geojson_data)
+    return geojson_data
+
+
+def _write_cache_file(path: str, content: bytes) -> None:
+    """
+    Atomically write a cache file so readers never see a partial download.
+    
+    Args:
+        path: Destination path
+        content: File content
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as temp_file:
+        temp_file.write(content)
+    os.replace(temp_file.name, path)
+
+
+def fetch_usgs_boundaries(cache_dir: Optional[str] = None,
+                          cache_ttl: Optional[float] = None) -> Optional[str]:
+    """
+    Make sure an up-to-date copy of the USGS LiDAR boundaries is cached on disk.
+    
+    The file is cached together with its ETag/Last-Modified headers. While the
+    cache is younger than ``cache_ttl`` it is used without touching the network;
+    after that it is revalidated with a conditional GET. If the network is
+    unavailable, the cached copy is used regardless of its age.
+    
+    Args:
+        cache_dir: Directory for the cached boundaries (default: from config)
+        cache_ttl: Seconds before the cached file is revalidated (default: from config)
+    
+    Returns:
+        str: Path to the cached GeoJSON file or None if no copy is available
+    """
+    if cache_dir is None:
+        cache_dir = get_cache_dir()
+    if cache_ttl is None:
+        cache_ttl = DEFAULT_CONFIG["boundaries_cache_ttl"]
+    
+    cache_path = os.path.join(cache_dir, BOUNDARIES_CACHE_FILENAME)
+    meta_path = os.path.join(cache_dir, BOUNDARIES_CACHE_META_FILENAME)
+    
+    # Read validators stored alongside the cached file
+    meta = {}
+    if os.path.exists(cache_path) and os.path.exists(meta_path):
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not read boundaries cache metadata: {str(e)}")
+    
+    # Use a fresh cache without any network traffic
+    if meta and time.time() - meta.get('fetched_at', 0) < cache_ttl:
+        logger.info(f"Using cached USGS LiDAR boundaries from {cache_path}")
+        return cache_path
+    
+    try:
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        
         logger.info(f"Downloading USGS LiDAR boundaries from {USGS_LIDAR_BOUNDARIES_URL}")
-        response = requests.get(USGS_LIDAR_BOUNDARIES_URL)
-        response.raise_for_status()
+        response = requests.get(USGS_LIDAR_BOUNDARIES_URL, headers=headers, timeout=60)
         
-        # Parse JSON response
-        geojson_data = response.json()
+        if response.status_code == 304 and os.path.exists(cache_path):
+            logger.info("USGS LiDAR boundaries not modified, using cached copy")
+            meta['fetched_at'] = time.time()
+            _write_cache_file(meta_path, json.dumps(meta).encode('utf-8'))
+            return cache_path
+        if response.status_code == 304:
+            # The cache disappeared between the check and the response
+            response = requests.get(USGS_LIDAR_BOUNDARIES_URL, timeout=60)
+        
+        response.raise_for_status()
         
         # Check if it's a valid GeoJSON FeatureCollection
+        geojson_data = response.json()
         if geojson_data.get('type') != 'FeatureCollection':
             logger.error("Downloaded data is not a valid GeoJSON FeatureCollection")
-            return None
+            return cache_path if os.path.exists(cache_path) else None
+        
+        # Update the on-disk cache
+        _write_cache_file(cache_path, response.content)
+        _write_cache_file(meta_path, json.dumps({
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time()
+        }).encode('utf-8'))
+        _parsed_boundaries[cache_path] = (os.path.getmtime(cache_path), geojson_data)
         
         logger.info(f"Successfully downloaded USGS LiDAR boundaries ({len(geojson_data.get('features', []))} features)")
-        return geojson_data
+        return cache_path
     
     except Exception as e:
+        # Fall back to the cached copy when offline
+        if os.path.exists(cache_path):
+            logger.warning(f"Could not refresh USGS LiDAR boundaries ({str(e)}), using cached copy from {cache_path}")
+            return cache_path
+        
         logger.error(f"Error downloading USGS LiDAR boundaries: {str(e)}")
         return None
 
 
+def download_usgs_boundaries(cache_dir: Optional[str] = None,
+                             cache_ttl: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    Download the USGS LiDAR boundaries GeoJSON file.
+    
+    Args:
+        cache_dir: Directory for the cached boundaries (default: from config)
+        cache_ttl: Seconds before the cached file is revalidated (default: from config)
+    
+    Returns:
+        dict: Parsed GeoJSON data or None if download failed
+    """
+    cache_path = fetch_usgs_boundaries(cache_dir, cache_ttl)
+    if not cache_path:
+        return None
+    return _load_cached_boundaries(cache_path)
+
+
+def build_usgs_catalog(usgs_boundaries: Dict[str, Any]) -> Optional[gpd.GeoDataFrame]:
+    """
+    Build a GeoDataFrame of dataset footprints from the USGS boundaries GeoJSON.
+    
+    Args:
+        usgs_boundaries: Parsed USGS boundaries FeatureCollection
+        
+    Returns:
+        GeoDataFrame: One row per dataset or None if no features were found
+    """
+    features = usgs_boundaries.get('features', [])
+    if not features:
+        logger.error("No features found in USGS boundaries")
+        return None
+    
+    # Create lists for geometries and properties
+    geometries = []
+    properties_list = []
+    
+    for feature in features:
+        geometry = feature.get('geometry')
+        properties = dict(feature.get('properties') or {})
+        
+        if geometry and properties and properties.get('name'):
+            geometries.append(shape(geometry))
+            properties_list.append(properties)
+    
+    # Create a GeoDataFrame for USGS boundaries
+    catalog = gpd.GeoDataFrame(
+        properties_list,
+        geometry=geometries,
+        crs="EPSG:4326"
+    )
+    
+    # Derive year and S3 location for every dataset in one pass
+    catalog['year'] = extract_years(catalog['name'])
+    if 'url' in catalog.columns:
+        catalog['s3_url'] = extract_s3_buckets_from_urls(catalog['url'])
+    
+    return catalog
+
+
+def load_usgs_catalog(config: Optional[Dict[str, Any]] = None) -> Optional[gpd.GeoDataFrame]:
+    """
+    Load the USGS dataset catalog together with its STRtree spatial index.
+    
+    The catalog is built once per boundaries file: it is kept in memory for the
+    rest of the process and persisted next to the cached boundaries so later
+    runs skip the GeoJSON parse. The spatial index is built on first load and
+    reused by every subsequent query.
+    
+    Args:
+        config: Optional configuration dictionary (used for cache settings)
+        
+    Returns:
+        GeoDataFrame: Catalog of dataset footprints or None if unavailable
+    """
+    config = config or {}
+    cache_dir = get_cache_dir(config)
+    
+    cache_path = fetch_usgs_boundaries(cache_dir, config.get('boundaries_cache_ttl'))
+    if not cache_path:
+        return None
+    source_mtime = os.path.getmtime(cache_path)
+    
+    # Reuse the catalog built earlier in this process
+    cached = _catalogs.get(cache_path)
+    if cached and cached[0] == source_mtime:
+        return cached[1]
+    
+    # Reuse the catalog persisted by an earlier run
+    catalog = None
+    catalog_path = os.path.join(cache_dir, CATALOG_CACHE_FILENAME)
+    if os.path.exists(catalog_path):
+        try:
+            with open(catalog_path, "rb") as f:
+                persisted = pickle.load(f)
+            if (persisted.get('version') == CATALOG_CACHE_VERSION
+                    and persisted.get('source_mtime') == source_mtime):
+                catalog = persisted['catalog']
+                logger.info(f"Loaded USGS dataset catalog from {catalog_path}")
+        except Exception as e:
+            logger.warning(f"Could not read cached USGS dataset catalog: {str(e)}")
+    
+    if catalog is None:
+        usgs_boundaries = _load_cached_boundaries(cache_path)
+        if not usgs_boundaries:
+            return None
+        catalog = build_usgs_catalog(usgs_boundaries)
+        if catalog is None:
+            return None
+        try:
+            _write_cache_file(catalog_path, pickle.dumps({
+                'version': CATALOG_CACHE_VERSION,
+                'source_mtime': source_mtime,
+                'catalog': catalog
+            }))
+        except Exception as e:
+            logger.warning(f"Could not cache USGS dataset catalog in {cache_dir}: {str(e)}")
+    
+    # Build the STRtree now so every query reuses it
+    catalog.sindex
+    _catalogs[cache_path] = (source_mtime, catalog)
+    return catalog
+
+
+def export_catalog_parquet(catalog: gpd.GeoDataFrame, parquet_path: str) -> bool:
+    """
+    Write the dataset catalog as GeoParquet.
+    
+    Only the name, url, year and s3_url columns are kept next to the WKB
+    geometry column, which keeps the file compact and fast to decode.
+    
+    Args:
+        catalog: Catalog returned by load_usgs_catalog()
+        parquet_path: Destination path for the GeoParquet file
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        columns = {}
+        for column in CATALOG_PARQUET_COLUMNS:
+            if column in catalog.columns:
+                columns[column] = catalog[column].values
+            elif column == 's3_url' and 'url' in catalog.columns:
+                columns[column] = extract_s3_buckets_from_urls(catalog['url']).values
+            else:
+                columns[column] = None
+        
+        table = gpd.GeoDataFrame(columns, geometry=catalog.geometry.values, crs=catalog.crs)
+        
+        output_dir = os.path.dirname(parquet_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        # Write next to the destination first so readers never see a partial file
+        temp_path = f"{parquet_path}.tmp"
+        table.to_parquet(temp_path, index=False)
+        os.replace(temp_path, parquet_path)
+        
+        logger.info(f"Exported {len(table)} datasets to {parquet_path}")
+        return True
+    
+    except ImportError as e:
+        logger.error(f"GeoParquet support requires pyarrow: {str(e)}")
+        return False
+    except Exception as e:
+        logger.error(f"Error exporting catalog to GeoParquet: {str(e)}")
+        return False
+
+
+def load_catalog_parquet(parquet_path: str) -> Optional[gpd.GeoDataFrame]:
+    """
+    Load a dataset catalog written by export_catalog_parquet().
+    
+    Geometries are decoded from WKB in a single vectorized call rather than
+    feature by feature. The result is kept in memory for the rest of the
+    process together with its STRtree spatial index.
+    
+    Args:
+        parquet_path: Path to the GeoParquet file
+        
+    Returns:
+        GeoDataFrame: Catalog of dataset footprints or None if unavailable
+    """
+    try:
+        mtime = os.path.getmtime(parquet_path)
+    except OSError:
+        logger.error(f"GeoParquet catalog not found: {parquet_path}")
+        return None
+    
+    cached = _catalogs.get(parquet_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    try:
+        catalog = gpd.read_parquet(parquet_path)
+    except ImportError as e:
+        logger.error(f"GeoParquet support requires pyarrow: {str(e)}")
+        return None
+    except Exception as e:
+        logger.error(f"Error loading GeoParquet catalog: {str(e)}")
+        return None
+    
+    # Build the STRtree now so every query reuses it
+    catalog.sindex
+    _catalogs[parquet_path] = (mtime, catalog)
+    logger.info(f"Loaded {len(catalog)} datasets from {parquet_path}")
+    return catalog
+
+
+def load_parquet_catalog(config: Optional[Dict[str, Any]] = None) -> Optional[gpd.GeoDataFrame]:
+    """
+    Load the GeoParquet catalog, exporting it from the boundaries when needed.
+    
+    An explicitly configured ``catalog_parquet`` file is used as is. The default
+    file in the cache directory is rebuilt from the USGS boundaries once it is
+    older than ``boundaries_cache_ttl``.
+    
+    Args:
+        config: Optional configuration dictionary
+        
+    Returns:
+        GeoDataFrame: Catalog of dataset footprints or None if unavailable
+    """
+    config = config or {}
+    
+    if config.get('catalog_parquet'):
+        return load_catalog_parquet(os.path.expanduser(config['catalog_parquet']))
+    
+    parquet_path = os.path.join(get_cache_dir(config), CATALOG_PARQUET_FILENAME)
+    cache_ttl = config.get('boundaries_cache_ttl')
+    if cache_ttl is None:
+        cache_ttl = DEFAULT_CONFIG["boundaries_cache_ttl"]
+    
+    stale = True
+    if os.path.exists(parquet_path):
+        stale = time.time() - os.path.getmtime(parquet_path) >= cache_ttl
+    
+    if stale:
+        catalog = load_usgs_catalog(config)
+        if catalog is not None and export_catalog_parquet(catalog, parquet_path):
+            return load_catalog_parquet(parquet_path)
+        if not os.path.exists(parquet_path):
+            return catalog
+        logger.warning(f"Using stale GeoParquet catalog {parquet_path}")
+    
+    return load_catalog_parquet(parquet_path)
+
+
+def query_catalog(catalog: gpd.GeoDataFrame, geometry) -> gpd.GeoDataFrame:
+    """
+    Select catalog rows whose footprint intersects a geometry.
+    
+    Candidates are found by bounding box through the catalog's STRtree and
+    only those are tested with the exact intersects predicate.
+    
+    Args:
+        catalog: Catalog returned by load_usgs_catalog()
+        geometry: Shapely geometry to test against
+        
+    Returns:
+        GeoDataFrame: Intersecting rows in catalog order
+    """
+    positions = catalog.sindex.query(geometry, predicate="intersects")
+    return catalog.iloc[sorted(positions)]
+
+
+def boundary_features(boundary_geojson: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Return the features of a GeoJSON boundary as a list.
+    
+    Args:
+        boundary_geojson: GeoJSON FeatureCollection, Feature or geometry
+        
+    Returns:
+        list: Features (a bare geometry is wrapped into a Feature)
+    """
+    if boundary_geojson.get('type') == 'FeatureCollection':
+        return list(boundary_geojson.get('features') or [])
+    elif boundary_geojson.get('type') == 'Feature':
+        return [boundary_geojson]
+    elif boundary_geojson.get('type') in ['Polygon', 'MultiPolygon', 'LineString', 'MultiLineString', 'Point', 'MultiPoint']:
+        return [{'type': 'Feature', 'geometry': boundary_geojson, 'properties': {}}]
+    return []
+
+
+def feature_labels(features: List[Dict[str, Any]]) -> List[str]:
+    """
+    Create unique, file-name safe labels for features.
+    
+    The feature id or 'name' property is used when present, otherwise the
+    1-based position of the feature.
+    
+    Args:
+        features: List of GeoJSON features
+        
+    Returns:
+        list: One label per feature
+    """
+    labels = []
+    seen = set()
+    for index, feature in enumerate(features):
+        properties = feature.get('properties') or {}
+        label = feature.get('id', properties.get('name'))
+        label = re.sub(r'[^A-Za-z0-9_.-]+', '_', str(label)).strip('_.') if label is not None else ''
+        if not label or label in seen:
+            label = f"{label}_{index + 1}" if label else str(index + 1)
+        seen.add(label)
+        labels.append(label)
+    return labels
+
+
 def boundary_to_gdf(boundary_geojson: Dict[str, Any]) -> Optional[gpd.GeoDataFrame]:
     """
-    Convert a GeoJSON boundary to a GeoDataFrame.
+    Convert a GeoJSON boundary to a GeoDataFrame with one row per feature.
     
     Args:
         boundary_geojson: GeoJSON boundary as a dictionary
@@ -82,18 +577,19 @@ def boundary_to_gdf(boundary_geojson: Dict[str, Any]) -> Optional[gpd.GeoDataFra
     try:
         # Handle different GeoJSON types
         if boundary_geojson.get('type') == 'FeatureCollection':
-            # If it's a FeatureCollection, use the first feature's geometry
+            # If it's a FeatureCollection, use every feature's geometry
             if not boundary_geojson.get('features'):
                 logger.error("GeoJSON FeatureCollection has no features")
                 return None
             
-            geometry = boundary_geojson['features'][0].get('geometry')
-            if not geometry:
-                logger.error("First feature in FeatureCollection has no geometry")
+            geometries = [
+                shape(feature['geometry']) for feature in boundary_geojson['features']
+                if feature.get('geometry')
+            ]
+            if not geometries:
+                logger.error("No feature in FeatureCollection has a geometry")
                 return None
             
-            geom_obj = shape(geometry)
-            
         elif boundary_geojson.get('type') == 'Feature':
             # If it's a Feature, use its geometry
             geometry = boundary_geojson.get('geometry')
@@ -101,18 +597,18 @@ def boundary_to_gdf(boundary_geojson: Dict[str, Any]) -> Optional[gpd.GeoDataFra
                 logger.error("GeoJSON Feature has no geometry")
                 return None
             
-            geom_obj = shape(geometry)
+            geometries = [shape(geometry)]
             
         elif boundary_geojson.get('type') in ['Polygon', 'MultiPolygon', 'LineString', 'MultiLineString', 'Point', 'MultiPoint']:
             # If it's a geometry, use it directly
-            geom_obj = shape(boundary_geojson)
+            geometries = [shape(boundary_geojson)]
             
         else:
             logger.error(f"Unsupported GeoJSON type: {boundary_geojson.get('type')}")
             return None
         
-        # Create a GeoDataFrame from the geometry
-        gdf = gpd.GeoDataFrame({'geometry': [geom_obj]}, crs="EPSG:4326")
+        # Create a GeoDataFrame with one row per geometry
+        gdf = gpd.GeoDataFrame({'geometry': geometries}, crs="EPSG:4326")
         return gdf
     
     except Exception as e:
@@ -120,91 +616,152 @@ def boundary_to_gdf(boundary_geojson: Dict[str, Any]) -> Optional[gpd.GeoDataFra
         return None
 
 
-def find_intersecting_datasets(boundary_geojson: Dict[str, Any]) -> List[Dict[str, Any]]:
+def boundary_geometry(boundary_geojson: Dict[str, Any]):
+    """
+    Get the combined geometry of all features in a GeoJSON boundary.
+    
+    Args:
+        boundary_geojson: GeoJSON boundary as a dictionary
+        
+    Returns:
+        Shapely geometry covering every feature, or None if there is none
+    """
+    geometries = [
+        shape(feature['geometry']) for feature in boundary_features(boundary_geojson)
+        if feature.get('geometry')
+    ]
+    if not geometries:
+        return None
+    if len(geometries) == 1:
+        return geometries[0]
+    return unary_union(geometries)
+
+
+def query_gpkg_catalog(gpkg_path: str, geometry) -> Optional[gpd.GeoDataFrame]:
+    """
+    Select GeoPackage catalog rows whose footprint intersects a geometry.
+    
+    The read uses a bounding box filter, which the GeoPackage driver answers
+    from the file's R-tree index, so only candidate rows are deserialized.
+    Candidates are then tested with the exact intersects predicate.
+    
+    Args:
+        gpkg_path: Path to the GeoPackage catalog
+        geometry: Shapely geometry in EPSG:4326 to test against
+        
+    Returns:
+        GeoDataFrame: Intersecting rows or None if the GeoPackage could not be read
+    """
+    if not os.path.exists(gpkg_path):
+        logger.error(f"GeoPackage catalog not found: {gpkg_path}")
+        return None
+    
+    try:
+        logger.info(f"Querying GeoPackage catalog {gpkg_path}")
+        candidates = gpd.read_file(gpkg_path, layer=GPKG_LAYER, bbox=tuple(geometry.bounds))
+        if len(candidates) == 0:
+            return candidates
+        
+        if candidates.crs is None:
+            candidates = candidates.set_crs("EPSG:4326")
+        elif candidates.crs.to_epsg() != 4326:
+            candidates = candidates.to_crs("EPSG:4326")
+        
+        return candidates[candidates.intersects(geometry)]
+    
+    except Exception as e:
+        logger.error(f"Error querying GeoPackage catalog: {str(e)}")
+        return None
+
+
+def catalog_rows_to_datasets(rows: gpd.GeoDataFrame,
+                             include_geometry: bool = True) -> List[Dict[str, Any]]:
+    """
+    Convert catalog rows into dataset dictionaries.
+    
+    Args:
+        rows: Catalog rows (from any catalog backend)
+        include_geometry: Whether to add the footprint as a GeoJSON geometry
+        
+    Returns:
+        list: List of dataset dictionaries with name, url, year, s3_url and geometry
+    """
+    # Catalogs without a precomputed S3 location (e.g. the GeoPackage) derive it here
+    if 's3_url' not in rows.columns and 'url' in rows.columns:
+        rows = rows.assign(s3_url=extract_s3_buckets_from_urls(rows['url']))
+    
+    columns = [c for c in ('name', 'url', 'year', 's3_url') if c in rows.columns]
+    records = rows[columns].to_dict('records')
+    
+    result = []
+    for record, geometry in zip(records, rows.geometry.values):
+        dataset = {
+            'name': record.get('name', ''),
+            'url': record.get('url', ''),
+        }
+        if include_geometry:
+            dataset['geometry'] = mapping(geometry)  # Convert to GeoJSON geometry
+        
+        # Add year if available
+        if 'year' in record:
+            dataset['year'] = record['year']
+        
+        # Add s3 url for EPT data
+        if record.get('s3_url'):
+            dataset['s3_url'] = record['s3_url']
+        
+        result.append(dataset)
+    
+    return result
+
+
+def find_intersecting_datasets(boundary_geojson: Dict[str, Any],
+                               config: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
     """
     Find USGS LiDAR datasets that intersect with the input boundary.
     
     Args:
         boundary_geojson: GeoJSON boundary as a dictionary
+        config: Optional configuration dictionary (used for catalog and cache settings)
         
     Returns:
         list: List of dataset dictionaries with name, url, year, and geometry
     """
-    # Download USGS LiDAR boundaries
-    usgs_boundaries = download_usgs_boundaries()
-    if not usgs_boundaries:
-        logger.error("Failed to download USGS LiDAR boundaries")
-        return []
+    config = config or {}
     
     # Convert boundary to GeoDataFrame
     boundary_gdf = boundary_to_gdf(boundary_geojson)
     if boundary_gdf is None:
         logger.error("Failed to convert boundary to GeoDataFrame")
         return []
+    boundary_geom = unary_union(boundary_gdf.geometry.values)
     
-    # Create a GeoDataFrame from the USGS boundaries
     try:
-        features = usgs_boundaries.get('features', [])
-        if not features:
-            logger.error("No features found in USGS boundaries")
-            return []
-        
-        # Create lists for geometries and properties
-        geometries = []
-        properties_list = []
-        
-        for feature in features:
-            geometry = feature.get('geometry')
-            properties = feature.get('properties', {})
+        if config.get('catalog_backend') == 'gpkg':
+            # Query the local GeoPackage through its R-tree index
+            gpkg_path = config.get('catalog_gpkg') or BUNDLED_GPKG_PATH
+            intersecting = query_gpkg_catalog(os.path.expanduser(gpkg_path), boundary_geom)
+            if intersecting is None:
+                return []
+        else:
+            # Load the USGS dataset catalog
+            if config.get('catalog_backend') == 'parquet':
+                usgs_gdf = load_parquet_catalog(config)
+            else:
+                usgs_gdf = load_usgs_catalog(config)
+            if usgs_gdf is None:
+                logger.error("Failed to load USGS LiDAR boundaries")
+                return []
             
-            if geometry and properties:
-                # Extract year from name and add it as a property
-                name = properties.get('name', '')
-                if name:
-                    year = extract_year(name)
-                    if year:
-                        properties['year'] = year
-                    
-                    # Add to lists
-                    geometries.append(shape(geometry))
-                    properties_list.append(properties)
-        
-        # Create a GeoDataFrame for USGS boundaries
-        usgs_gdf = gpd.GeoDataFrame(
-            properties_list,
-            geometry=geometries,
-            crs="EPSG:4326"
-        )
-        
-        # Find intersecting datasets
-        logger.info("Finding intersecting datasets")
-        intersecting = usgs_gdf[usgs_gdf.intersects(boundary_gdf.iloc[0].geometry)]
+            # Find intersecting datasets
+            logger.info("Finding intersecting datasets")
+            intersecting = query_catalog(usgs_gdf, boundary_geom)
         
         if len(intersecting) == 0:
             logger.info("No intersecting datasets found")
             return []
         
-        # Prepare result list with dataset information
-        result = []
-        for _, row in intersecting.iterrows():
-            dataset = {
-                'name': row.get('name', ''),
-                'url': row.get('url', ''),
-                'geometry': mapping(row.geometry),  # Convert to GeoJSON geometry
-            }
-            
-            # Add year if available
-            if 'year' in row:
-                dataset['year'] = row['year']
-                
-            # Add s3 url for EPT data
-            if 'url' in row and row['url']:
-                # Extract bucket information from the URL
-                s3_url = extract_s3_bucket_from_url(row['url'])
-                if s3_url:
-                    dataset['s3_url'] = s3_url
-            
-            result.append(dataset)
+        result = catalog_rows_to_datasets(intersecting)
         
         logger.info(f"Found {len(result)} intersecting datasets")
         return result
@@ -216,6 +773,196 @@ def find_intersecting_datasets(boundary_geojson: Dict[str, Any]) -> List[Dict[st
         return []
 
 
+def load_aois(source: str) -> Optional[gpd.GeoDataFrame]:
+    """
+    Load areas of interest from a GeoJSON file or a directory of GeoJSON files.
+    
+    Every feature becomes one AOI. The AOI id is the file name for single-feature
+    files and the file name plus the feature label for multi-feature files.
+    
+    Args:
+        source: Path to a GeoJSON file or a directory containing GeoJSON files
+        
+    Returns:
+        GeoDataFrame: AOIs with 'aoi' and 'source' columns or None if none could be loaded
+    """
+    if os.path.isdir(source):
+        paths = [
+            os.path.join(source, name) for name in sorted(os.listdir(source))
+            if name.lower().endswith(('.geojson', '.json'))
+        ]
+    else:
+        paths = [source]
+    
+    aoi_ids = []
+    seen_ids = set()
+    sources = []
+    geometries = []
+    for path in paths:
+        try:
+            with open(path, 'r') as f:
+                geojson_data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Skipping unreadable GeoJSON {path}: {str(e)}")
+            continue
+        
+        stem = os.path.splitext(os.path.basename(path))[0]
+        features = boundary_features(geojson_data)
+        labels = feature_labels(features)
+        for index, feature in enumerate(features):
+            geometry = feature.get('geometry')
+            if not geometry:
+                logger.warning(f"Skipping feature {index + 1} without geometry in {path}")
+                continue
+            
+            aoi_id = stem if len(features) == 1 else f"{stem}_{labels[index]}"
+            if aoi_id in seen_ids:
+                aoi_id = f"{aoi_id}_{len(aoi_ids) + 1}"
+            seen_ids.add(aoi_id)
+            aoi_ids.append(aoi_id)
+            sources.append(path)
+            geometries.append(shape(geometry))
+    
+    if not geometries:
+        logger.error(f"No AOI geometries found in {source}")
+        return None
+    
+    logger.info(f"Loaded {len(geometries)} AOIs from {source}")
+    return gpd.GeoDataFrame(
+        {'aoi': aoi_ids, 'source': sources},
+        geometry=geometries,
+        crs="EPSG:4326"
+    )
+
+
+def find_intersecting_datasets_batch(aois: gpd.GeoDataFrame,
+                                     config: Optional[Dict[str, Any]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Find the intersecting USGS LiDAR datasets for many AOIs at once.
+    
+    The catalog is loaded once and matched against every AOI with a single
+    spatial join.
+    
+    Args:
+        aois: AOIs returned by load_aois()
+        config: Optional configuration dictionary (used for catalog and cache settings)
+        
+    Returns:
+        dict: AOI id -> list of dataset dictionaries (without geometry), in AOI order
+    """
+    config = config or {}
+    result = {aoi: [] for aoi in aois['aoi']}
+    
+    try:
+        if config.get('catalog_backend') == 'gpkg':
+            # Only read the GeoPackage rows inside the overall AOI extent
+            gpkg_path = os.path.expanduser(config.get('catalog_gpkg') or BUNDLED_GPKG_PATH)
+            usgs_gdf = query_gpkg_catalog(gpkg_path, box(*aois.total_bounds))
+        elif config.get('catalog_backend') == 'parquet':
+            usgs_gdf = load_parquet_catalog(config)
+        else:
+            usgs_gdf = load_usgs_catalog(config)
+        if usgs_gdf is None:
+            logger.error("Failed to load USGS LiDAR boundaries")
+            return result
+        
+        logger.info(f"Joining {len(aois)} AOIs against {len(usgs_gdf)} datasets")
+        joined = gpd.sjoin(
+            aois[['aoi', 'geometry']].reset_index(drop=True),
+            usgs_gdf,
+            how='inner',
+            predicate='intersects'
+        )
+        if len(joined) == 0:
+            logger.info("No intersecting datasets found")
+            return result
+        
+        # Keep the catalog order within each AOI
+        joined = joined.sort_values(['index_right'], kind='stable')
+        datasets = catalog_rows_to_datasets(usgs_gdf.loc[joined['index_right']], include_geometry=False)
+        for aoi, dataset in zip(joined['aoi'], datasets):
+            result[aoi].append(dataset)
+        
+        logger.info(f"Found {len(joined)} AOI/dataset intersections")
+        return result
+    
+    except Exception as e:
+        logger.error(f"Error finding intersecting datasets for AOIs: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return result
+
+
+def write_batch_manifest(aois: gpd.GeoDataFrame, results: Dict[str, List[Dict[str, Any]]],
+                         manifest_path: str) -> bool:
+    """
+    Write the batch query results as a JSON or CSV manifest.
+    
+    The format is chosen from the file extension (.csv for CSV, JSON otherwise).
+    In CSV, AOIs without any intersecting dataset get a row with empty dataset columns.
+    
+    Args:
+        aois: AOIs returned by load_aois()
+        results: Result of find_intersecting_datasets_batch()
+        manifest_path: Destination path
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        output_dir = os.path.dirname(manifest_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        sources = dict(zip(aois['aoi'], aois['source']))
+        fields = ['name', 'year', 'url', 's3_url']
+        
+        if manifest_path.lower().endswith('.csv'):
+            with open(manifest_path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['aoi', 'source'] + fields)
+                for aoi, datasets in results.items():
+                    if not datasets:
+                        writer.writerow([aoi, sources.get(aoi, '')] + [''] * len(fields))
+                    for dataset in datasets:
+                        writer.writerow([aoi, sources.get(aoi, '')] + [
+                            _manifest_value(dataset.get(field)) for field in fields
+                        ])
+        else:
+            manifest = {
+                'aois': [
+                    {
+                        'aoi': aoi,
+                        'source': sources.get(aoi, ''),
+                        'datasets': [
+                            {field: _manifest_value(dataset.get(field)) for field in fields}
+                            for dataset in datasets
+                        ]
+                    }
+                    for aoi, datasets in results.items()
+                ]
+            }
+            with open(manifest_path, 'w') as f:
+                json.dump(manifest, f, indent=4)
+        
+        logger.info(f"Batch manifest saved to {manifest_path}")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Error writing batch manifest: {str(e)}")
+        return False
+
+
+def _manifest_value(value: Any) -> Any:
+    """Convert a dataset value to something JSON/CSV friendly (years as ints, NaN as None)."""
+    if isinstance(value, float):
+        if value != value:
+            return None
+        if value.is_integer():
+            return int(value)
+    return value
+
+
 def extract_s3_bucket_from_url(url: str) -> Optional[str]:
     """
     Extract S3 bucket URL from the dataset URL.
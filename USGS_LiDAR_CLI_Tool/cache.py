@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+USGS LiDAR Disk Cache Module
+
+This module provides a size-bounded on-disk cache with least-recently-used
+eviction, shared by the EPT metadata and EPT node caches.
+"""
+
+import os
+import time
+import uuid
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fraction of max_bytes the cache is trimmed to once it goes over budget
+EVICT_LOW_WATER = 0.9
+
+
+class DiskCache:
+    """
+    Directory of cached files bounded by their total size.
+
+    Entries are addressed by relative paths inside the cache directory, so
+    callers choose the layout (content hashes, mirrored URL paths, ...).
+    Reading an entry bumps its modification time, and once the total size
+    exceeds ``max_bytes`` the least recently used entries are removed until
+    it is below ``EVICT_LOW_WATER`` of that size. Pinned entries are never
+    evicted, so a job can keep the entries it is reading; they still count
+    towards the total size. The entries and their sizes
+    are indexed in memory by a single directory scan on first use, so writes
+    do not rescan the directory. Writes are atomic, so several threads and
+    processes can share a cache; entries written by other processes are
+    picked up by the next scan.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        Create a cache rooted at ``directory``.
+
+        Args:
+            directory: Cache directory (created on first write)
+            max_bytes: Maximum total size of the cached files
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: Optional[Dict[str, Tuple[float, int]]] = None
+        self._size = 0
+        self._pins: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> str:
+        """
+        Get the file path of an entry.
+
+        Args:
+            key: Relative path of the entry
+
+        Returns:
+            str: Absolute path inside the cache directory
+        """
+        return os.path.join(self.directory, *key.split("/"))
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Read an entry and mark it as recently used.
+
+        Args:
+            key: Relative path of the entry
+
+        Returns:
+            bytes: Cached content or None on a miss
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            self.touch(key)
+            return data
+        except OSError:
+            return None
+
+    def touch(self, key: str) -> bool:
+        """
+        Mark an entry as recently used.
+
+        Args:
+            key: Relative path of the entry
+
+        Returns:
+            bool: True if the entry exists
+        """
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return False
+        with self._lock:
+            entries = self._index()
+            if path in entries:
+                entries[path] = (time.time(), entries[path][1])
+        return True
+
+    def put(self, key: str, data: bytes) -> Optional[str]:
+        """
+        Store an entry and evict old entries if the cache is over its size.
+
+        Args:
+            key: Relative path of the entry
+            data: Content to store
+
+        Returns:
+            str: Path of the stored entry or None if it could not be written
+        """
+        if len(data) > self.max_bytes:
+            return None
+
+        path = self.path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {path}: {str(e)}")
+            return None
+
+        with self._lock:
+            entries = self._index()
+            previous = entries.get(path, (0.0, 0))[1]
+            entries[path] = (time.time(), len(data))
+            self._size += len(data) - previous
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+        return path
+
+    def pin(self, keys: List[str]) -> None:
+        """
+        Protect entries from eviction until they are unpinned.
+
+        Keys may be pinned before their entries are written and may be
+        pinned several times; each pin needs its own unpin.
+
+        Args:
+            keys: Relative paths of the entries
+        """
+        with self._lock:
+            for key in keys:
+                path = self.path(key)
+                self._pins[path] = self._pins.get(path, 0) + 1
+
+    def unpin(self, keys: List[str]) -> None:
+        """
+        Release entries pinned with pin().
+
+        Args:
+            keys: Relative paths of the entries
+        """
+        with self._lock:
+            for key in keys:
+                path = self.path(key)
+                count = self._pins.get(path, 0) - 1
+                if count > 0:
+                    self._pins[path] = count
+                else:
+                    self._pins.pop(path, None)
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache is below its low-water mark.
+
+        Trimming below ``max_bytes`` leaves room for further writes, so a
+        full cache is not trimmed again on every write.
+
+        Returns:
+            int: Number of bytes removed
+        """
+        with self._lock:
+            entries = self._index()
+            target = int(self.max_bytes * EVICT_LOW_WATER)
+            removed = 0
+            for path, (_, size) in sorted(entries.items(), key=lambda item: item[1][0]):
+                if self._size <= target:
+                    break
+                if path in self._pins:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    # Already removed by another process
+                    pass
+                except OSError:
+                    continue
+                del entries[path]
+                self._size -= size
+                removed += size
+            if self._size > self.max_bytes:
+                logger.warning(f"Cache {self.directory} holds {self._size / (1024 * 1024):.1f} MB of pinned "
+                               f"entries, over its {self.max_bytes / (1024 * 1024):.1f} MB budget")
+
+        if removed:
+            logger.info(f"Evicted {removed / (1024 * 1024):.1f} MB from cache {self.directory}")
+        return removed
+
+    def _index(self) -> Dict[str, Tuple[float, int]]:
+        """Return the (last use, size) of every entry, scanning the directory once (the caller holds the lock)."""
+        if self._entries is None:
+            self._entries = {path: (mtime, size) for mtime, path, size in self._scan()}
+            self._size = sum(size for _, size in self._entries.values())
+        return self._entries
+
+    def _scan(self) -> List[Tuple[float, str, int]]:
+        """List (mtime, path, size) of every cached file, skipping partial writes."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
@@ -22,9 +22,15 @@ from typing import Optional, List, Dict, Any
 from shapely.geometry import shape, box, mapping
 from shapely.ops import unary_union
 
-from .boundaries import find_intersecting_datasets
-from .download import download_lidar_data, get_point_count
-from .config import load_config
+from .boundaries import (
+    boundary_features, feature_labels, find_intersecting_datasets,
+    find_intersecting_datasets_batch, load_aois, write_batch_manifest
+)
+from .download import download_lidar_data_parallel, get_point_count, plan_lidar_downloads
+from .config import load_config, validate_config
+from .ept import configure_ept
+from .scheduler import configure_scheduler
+from .manifest import JobManifest
 from .visualization import create_coverage_map, verify_dataset_coverage
 
 # Set up logging
@@ -36,15 +42,150 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def apply_config_overrides(config: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Override configuration values with command line arguments.
+    
+    The merged configuration is validated again, so invalid command line
+    values fall back to their defaults just like invalid config file values.
+    
+    Args:
+        config: Configuration dictionary
+        args: Parsed command line arguments
+        
+    Returns:
+        dict: Updated and validated configuration dictionary
+    """
+    if args.resolution:
+        config["resolution"] = args.resolution
+    if args.workers:
+        config["download_workers"] = args.workers
+    if args.cpu_workers:
+        config["cpu_workers"] = args.cpu_workers
+    if args.max_http_requests:
+        config["max_http_requests"] = args.max_http_requests
+    if args.max_bandwidth:
+        config["max_bandwidth_mbps"] = args.max_bandwidth
+    if args.ept_cache:
+        config["ept_node_cache"] = True
+    if args.ept_mirror:
+        config["ept_mirror"] = args.ept_mirror
+    if args.classify_ground:
+        config["classify_ground"] = True
+    if args.coordinate_reference_system:
+        config["coordinate_reference_system"] = args.coordinate_reference_system
+    if args.outlier_filter:
+        config["outlier_filter"] = True
+    if args.outlier_mean_k:
+        config["outlier_mean_k"] = args.outlier_mean_k
+    if args.outlier_multiplier:
+        config["outlier_multiplier"] = args.outlier_multiplier
+    if args.catalog:
+        config["catalog_backend"] = args.catalog
+    if args.pdal_engine:
+        config["pdal_engine"] = args.pdal_engine
+    if args.add_year:
+        config["add_year"] = True
+    if args.year_tagging:
+        config["year_tagging"] = args.year_tagging
+    if args.no_stream:
+        config["stream_mode"] = "never"
+    if args.tiled:
+        config["tiled"] = True
+    if args.tile_size is not None:
+        config["tile_size"] = args.tile_size
+    if args.tile_max_points is not None:
+        config["tile_max_points"] = args.tile_max_points
+    if args.tile_buffer is not None:
+        config["tile_buffer"] = args.tile_buffer
+    if args.no_merge_tiles:
+        config["merge_tiles"] = False
+    if args.merge_format:
+        config["merge_format"] = args.merge_format
+    if args.merge_engine:
+        config["merge_engine"] = args.merge_engine
+    # Coverage method removed - simplified approach used
+    return validate_config(config)
+
+
+def log_download_plan(download_jobs: List[Dict[str, Any]], config: Dict[str, Any]) -> None:
+    """
+    Log the estimated points, bytes and EPT node fetches of each download.
+    
+    Args:
+        download_jobs: List of dictionaries with 'boundary', 'dataset' and 'filename' keys
+        config: Configuration dictionary
+    """
+    plans = plan_lidar_downloads(download_jobs, config)
+    
+    logger.info(f"Download estimate (resolution: {config.get('resolution') or 'full'}):")
+    totals = {'points': 0, 'bytes': 0, 'nodes': 0, 'hierarchy_fetches': 0}
+    for job, plan in zip(download_jobs, plans):
+        if plan is None:
+            logger.info(f"  - {job['filename']}: estimate unavailable")
+            continue
+        logger.info(f"  - {job['filename']}: ~{plan['points']:,} points, "
+                    f"~{plan['bytes'] / (1024 * 1024):,.1f} MB from {plan['nodes']:,} EPT nodes "
+                    f"({plan['hierarchy_fetches']} hierarchy fetches)")
+        for key in totals:
+            totals[key] += plan[key]
+    
+    logger.info(f"Total: ~{totals['points']:,} points, ~{totals['bytes'] / (1024 * 1024):,.1f} MB "
+                f"from {totals['nodes']:,} EPT nodes ({totals['hierarchy_fetches']} hierarchy fetches)")
+
+
+def run_batch(args: argparse.Namespace, base_output_dir: Path) -> int:
+    """
+    Match many AOIs against the dataset catalog and write a manifest.
+    
+    Args:
+        args: Parsed command line arguments
+        base_output_dir: Output directory
+        
+    Returns:
+        int: Exit code
+    """
+    try:
+        config = apply_config_overrides(load_config(args.config), args)
+        configure_ept(config)
+        
+        aois = load_aois(args.batch)
+        if aois is None:
+            return 1
+        
+        results = find_intersecting_datasets_batch(aois, config)
+        
+        matched = sum(1 for datasets in results.values() if datasets)
+        logger.info(f"{matched} of {len(results)} AOIs intersect at least one USGS LiDAR dataset")
+        
+        manifest_path = args.manifest or str(base_output_dir / "batch_manifest.json")
+        if not write_batch_manifest(aois, results, manifest_path):
+            return 1
+        return 0
+    
+    except Exception as e:
+        logger.error(f"Error: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return 1
+
+
 def main():
     """Main entry point for the CLI"""
     parser = argparse.ArgumentParser(
         description="Download USGS LiDAR data based on GeoJSON boundaries"
     )
-    parser.add_argument(
-        "--geojson", "-g", type=str, required=True,
+    input_group = parser.add_mutually_exclusive_group(required=True)
+    input_group.add_argument(
+        "--geojson", "-g", type=str,
         help="Path to input GeoJSON file defining the boundary"
     )
+    input_group.add_argument(
+        "--batch", type=str,
+        help="Path to a GeoJSON FeatureCollection or a directory of GeoJSON files. "
+             "Every feature is matched against the dataset catalog in one pass and the "
+             "intersecting datasets are written to a manifest (no data is downloaded)"
+    )
     parser.add_argument(
         "--output-dir", "-o", type=str, default="lidar_data",
         help="Output directory for downloaded LAZ files (default: lidar_data)"
@@ -64,7 +205,30 @@ def main():
     )
     parser.add_argument(
         "--workers", "-w", type=int,
-        help="Number of parallel workers (default: from config or 8)"
+        help="Number of datasets downloaded in parallel (default: from config or 8)"
+    )
+    parser.add_argument(
+        "--cpu-workers", type=int,
+        help="Maximum number of PDAL pipelines running at once across all datasets and tiles "
+             "(default: from config or one per CPU)"
+    )
+    parser.add_argument(
+        "--max-http-requests", type=int,
+        help="Maximum number of in-flight HTTP requests to S3 across all downloads (default: from config or 64)"
+    )
+    parser.add_argument(
+        "--max-bandwidth", type=float,
+        help="Aggregate bandwidth limit in MB/s for EPT data fetched by the tool (default: unlimited)"
+    )
+    parser.add_argument(
+        "--ept-cache", action="store_true",
+        help="Mirror the EPT nodes each download needs into the local cache and read them from disk, "
+             "so repeated or overlapping extractions skip S3"
+    )
+    parser.add_argument(
+        "--ept-mirror", type=str,
+        help="Base URL or directory of an EPT mirror or caching proxy to read instead of S3, "
+             "laid out as <base>/<dataset>/ept.json (without the bucket name)"
     )
     parser.add_argument(
         "--verbose", "-v", action="store_true",
@@ -72,7 +236,13 @@ def main():
     )
     parser.add_argument(
         "--dry-run", "-d", action="store_true",
-        help="Find intersecting datasets but don't download files"
+        help="Find intersecting datasets and estimate the download size from the EPT "
+             "hierarchy, but don't download files"
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Skip datasets and tiles recorded as complete in the job manifest "
+             "(<geojson>_job.json) by a previous run; only missing or failed work is redone"
     )
     parser.add_argument(
         "--keep-temp", "-k", action="store_true",
@@ -87,6 +257,69 @@ def main():
         "--no-visualization", action="store_true",
         help="Skip creating visualization of datasets and boundary"
     )
+    parser.add_argument(
+        "--per-feature", action="store_true",
+        help="Process every feature of a multi-feature GeoJSON separately, writing one LAZ file "
+             "per feature and dataset named <geojson>_<feature>_<dataset>.laz. Features are "
+             "labelled by their id or 'name' property, or by their position"
+    )
+    parser.add_argument(
+        "--tiled", action="store_true",
+        help="Split each dataset download into tiles that are processed in parallel "
+             "and merged afterwards; failed tiles are retried on their own"
+    )
+    parser.add_argument(
+        "--tile-size", type=float,
+        help="Tile edge length in meters for --tiled (default: from config or 1000)"
+    )
+    parser.add_argument(
+        "--tile-max-points", type=int,
+        help="With --tiled, recursively split tiles whose estimated EPT point count exceeds this "
+             "so dense areas do not stall the pool (default: from config or disabled)"
+    )
+    parser.add_argument(
+        "--tile-buffer", type=float,
+        help="With --tiled, meters read around each tile so ground classification and the outlier "
+             "filter see neighboring points; the buffer is cropped away before writing "
+             "(default: from config, or derived from the SMRF window and outlier mean_k)"
+    )
+    parser.add_argument(
+        "--no-merge-tiles", action="store_true",
+        help="With --tiled, keep the individual tile LAZ files instead of merging them"
+    )
+    parser.add_argument(
+        "--merge-format", type=str, choices=["laz", "copc"],
+        help="Format of merged tile outputs: 'laz', or 'copc' for a cloud-optimized point cloud "
+             "written by PDAL (default: from config or laz)"
+    )
+    parser.add_argument(
+        "--merge-engine", type=str, choices=["auto", "laspy", "pdal"],
+        help="How tiles are merged into LAZ: 'laspy' streams chunks with parallel LAZ (de)compression "
+             "and drops points duplicated across tile edges, 'pdal' uses pdal merge, 'auto' tries laspy "
+             "first (default: from config or auto)"
+    )
+    parser.add_argument(
+        "--pdal-engine", type=str, choices=["auto", "python", "subprocess"],
+        help="How PDAL pipelines are executed: 'python' runs them in-process with the PDAL "
+             "Python bindings, 'subprocess' uses the pdal command, 'auto' prefers the bindings "
+             "when installed (default: from config or auto)"
+    )
+    parser.add_argument(
+        "--no-stream", action="store_true",
+        help="Always run PDAL pipelines in standard mode. By default pipelines made only of "
+             "streamable stages run in stream mode with bounded memory"
+    )
+    parser.add_argument(
+        "--add-year", action="store_true",
+        help="Tag every point with the dataset acquisition year (Year extra dimension) and add "
+             "a USGS_LiDAR_CLI Year VLR, as part of the PDAL pipeline"
+    )
+    parser.add_argument(
+        "--year-tagging", type=str, choices=["pipeline", "rewrite", "vlr"],
+        help="How --add-year tags the output: 'pipeline' inside the PDAL pipeline, 'rewrite' "
+             "by rewriting the finished file in chunks with laspy, 'vlr' by only adding the Year VLR "
+             "without touching point records (default: from config or pipeline)"
+    )
     parser.add_argument(
         "--classify-ground", action="store_true",
         help="Apply SMRF ground classification to point clouds during download"
@@ -108,6 +341,17 @@ def main():
         "--outlier-multiplier", type=float, default=2.2,
         help="Standard deviation multiplier threshold for outlier filter (default: 2.2)"
     )
+    parser.add_argument(
+        "--catalog", type=str, choices=["geojson", "gpkg", "parquet"],
+        help="Dataset catalog to search: 'geojson' downloads the USGS boundaries file, "
+             "'gpkg' queries the local usgs_lidar_boundaries.gpkg, 'parquet' uses a GeoParquet "
+             "copy of the catalog (requires pyarrow) (default: from config or geojson)"
+    )
+    parser.add_argument(
+        "--manifest", type=str,
+        help="Output path for the --batch manifest; use a .csv extension for CSV "
+             "(default: <output-dir>/batch_manifest.json)"
+    )
     # Removed the --coverage-method option as requested
     
     args = parser.parse_args()
@@ -120,6 +364,9 @@ def main():
     base_output_dir = Path(args.output_dir)
     base_output_dir.mkdir(parents=True, exist_ok=True)
     
+    if args.batch:
+        return run_batch(args, base_output_dir)
+    
     # Extract geojson filename to use for the subfolder and LAZ files
     geojson_filename = Path(args.geojson).stem
     
@@ -132,21 +379,9 @@ def main():
         config = load_config(args.config)
         
         # Override config with command line arguments
-        if args.resolution:
-            config["resolution"] = args.resolution
-        if args.workers:
-            config["download_workers"] = args.workers
-        if args.classify_ground:
-            config["classify_ground"] = True
-        if args.coordinate_reference_system:
-            config["coordinate_reference_system"] = args.coordinate_reference_system
-        if args.outlier_filter:
-            config["outlier_filter"] = True
-        if args.outlier_mean_k:
-            config["outlier_mean_k"] = args.outlier_mean_k
-        if args.outlier_multiplier:
-            config["outlier_multiplier"] = args.outlier_multiplier
-        # Coverage method removed - simplified approach used
+        config = apply_config_overrides(config, args)
+        configure_ept(config)
+        scheduler = configure_scheduler(config)
         
         # Load the input GeoJSON
         with open(args.geojson, 'r') as f:
@@ -154,7 +389,7 @@ def main():
         
         # Find intersecting datasets
         logger.info(f"Finding USGS LiDAR datasets that intersect with the input boundary")
-        datasets = find_intersecting_datasets(boundary_geojson)
+        datasets = find_intersecting_datasets(boundary_geojson, config)
         
         if not datasets:
             logger.warning("No intersecting USGS LiDAR datasets found")
@@ -166,22 +401,52 @@ def main():
         logger.info(f"Found {len(datasets)} intersecting datasets")
         for i, dataset in enumerate(datasets, 1):
             logger.info(f"  {i}. {dataset['name']} ({dataset.get('year', 'Unknown year')})")
+        
+        # Build the list of downloads: one per dataset for the whole boundary, or
+        # one per feature and intersecting dataset when processing features separately
+        features = boundary_features(boundary_geojson)
+        per_feature = args.per_feature and len(features) > 1
+        download_jobs = []
+        if per_feature:
+            # Dataset footprints are parsed once and shared by all features
+            dataset_shapes = {dataset['name']: shape(dataset['geometry']) for dataset in datasets}
+            for feature, label in zip(features, feature_labels(features)):
+                if not feature.get('geometry'):
+                    logger.warning(f"Skipping feature {label} without geometry")
+                    continue
+                feature_shape = shape(feature['geometry'])
+                feature_datasets = [
+                    dataset for dataset in datasets
+                    if dataset_shapes[dataset['name']].intersects(feature_shape)
+                ]
+                if args.most_recent:
+                    feature_datasets = feature_datasets[:1]
+                for dataset in feature_datasets:
+                    download_jobs.append({
+                        'boundary': feature,
+                        'dataset': dataset,
+                        'filename': f"{geojson_filename}_{label}_{dataset['name']}"
+                    })
+            logger.info(f"Processing {len(features)} features separately ({len(download_jobs)} downloads)")
+        else:
+            selected_datasets = datasets[:1] if args.most_recent else datasets
+            for dataset in selected_datasets:
+                download_jobs.append({
+                    'boundary': boundary_geojson,
+                    'dataset': dataset,
+                    'filename': f"{geojson_filename}_{dataset['name']}"
+                })
+        
+        # Track which datasets will actually be downloaded
+        downloaded_dataset_names = []
+        for job in download_jobs:
+            if job['dataset']['name'] not in downloaded_dataset_names:
+                downloaded_dataset_names.append(job['dataset']['name'])
             
         # Create visualization of the boundary and dataset geometries
         if not args.no_visualization:
             visualization_path = output_dir / f"{geojson_filename}_coverage.png"
             
-            # Track which datasets will actually be downloaded
-            downloaded_dataset_names = []
-            
-            # For most-recent flag, only the most recent dataset is used
-            if args.most_recent and datasets:
-                downloaded_dataset_names.append(datasets[0]['name'])
-            else:
-                # All datasets will be downloaded
-                for dataset in datasets:
-                    downloaded_dataset_names.append(dataset['name'])
-            
             # Create visualization showing only datasets that will be downloaded
             create_coverage_map(boundary_geojson, datasets, str(visualization_path), 
                                downloaded_datasets=downloaded_dataset_names)
@@ -204,6 +469,7 @@ def main():
         # If dry-run is enabled, just print datasets and exit
         if args.dry_run:
             logger.info("Dry run mode - not downloading files")
+            log_download_plan(download_jobs, config)
             return 0
         
         # Create temp directory for intermediate files if needed
@@ -225,97 +491,57 @@ def main():
         
         info_content.append(f"")
         info_content.append(f"Download Strategy: {'Most recent data only' if args.most_recent else 'All intersecting datasets'}")
+        if per_feature:
+            info_content.append(f"Features: {len(features)} processed separately")
         info_content.append(f"")
         info_content.append(f"Download Log:")
         
-        # Download LAZ files from each dataset
-        downloaded_files = []
-        # Keep track of which file came from which dataset and its year
-        file_source_map = {}
-        
-        # If most-recent flag is set, download only the most recent dataset
-        if args.most_recent and datasets:
-            # Get only the most recent dataset (datasets are already sorted by year, most recent first)
+        if args.most_recent and not per_feature:
+            # Datasets are already sorted by year, most recent first
             dataset = datasets[0]
-            dataset_name = dataset['name']
-            dataset_year = dataset.get('year', 'Unknown year')
-            
-            # Log what we're doing
-            log_msg = f"Using only the most recent dataset: {dataset_name} ({dataset_year})"
+            log_msg = f"Using only the most recent dataset: {dataset['name']} ({dataset.get('year', 'Unknown year')})"
             logger.info(log_msg)
             info_content.append(f"  - {log_msg}")
-            
-            # Create output directory for this dataset
-            dataset_dir = output_dir
-            
-            # Create a unique filename for this dataset that includes the dataset name
-            unique_filename = f"{geojson_filename}_{dataset_name}"
-            
-            # Download data for this dataset
-            logger.info(f"Downloading data from {dataset_name}")
-            files = download_lidar_data(
-                boundary_geojson=boundary_geojson,
-                dataset=dataset,
-                output_dir=str(dataset_dir),
-                config=config,
-                geojson_filename=unique_filename
-            )
+        
+        # Download LAZ files for all jobs concurrently - no merging
+        for job in download_jobs:
+            logger.info(f"Downloading data from {job['dataset']['name']} to {job['filename']}.laz")
+        manifest = JobManifest(str(output_dir / f"{geojson_filename}_job.json"), resume=args.resume)
+        job_files = download_lidar_data_parallel(download_jobs, str(output_dir), config, manifest)
+        scheduler.log_metrics()
+        
+        # Log results in job order
+        downloaded_files = []
+        files_per_dataset = {}
+        for job, files in zip(download_jobs, job_files):
+            dataset = job['dataset']
+            unique_filename = job['filename']
+            files_per_dataset[dataset['name']] = files_per_dataset.get(dataset['name'], 0) + len(files)
             
             if files:
+                # Keep track of all downloaded files
                 downloaded_files.extend(files)
                 
                 # Log success
-                log_msg = f"Successfully downloaded {len(files)} files from {dataset_name}"
+                log_msg = f"Successfully downloaded {len(files)} files from {dataset['name']}"
                 logger.info(log_msg)
                 info_content.append(f"  - {log_msg}")
                 info_content.append(f"    Output file: {unique_filename}.laz")
             else:
-                log_msg = f"No data downloaded from {dataset_name}"
+                log_msg = f"No data downloaded from {dataset['name']}"
                 logger.warning(log_msg)
                 info_content.append(f"  - {log_msg}")
-            
+        
+        if args.most_recent:
             # Add data source information
             info_content.append(f"")
             info_content.append(f"Data Source:")
-            info_content.append(f"  - {dataset_name}: {len(files) if files else 0} files")
-        else:
-            # Download from all datasets separately - no merging
-            for dataset in datasets:
-                # Create output directory for this dataset (inside the main output dir)
-                dataset_dir = output_dir
-                dataset_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Create a unique filename for this dataset
-                unique_filename = f"{geojson_filename}_{dataset['name']}"
-                
-                logger.info(f"Downloading data from {dataset['name']}")
-                files = download_lidar_data(
-                    boundary_geojson=boundary_geojson,
-                    dataset=dataset,
-                    output_dir=str(dataset_dir),
-                    config=config,
-                    geojson_filename=unique_filename
-                )
-                
-                if files:
-                    
-                    # Keep track of all downloaded files
-                    downloaded_files.extend(files)
-                    
-                    # Log success
-                    log_msg = f"Successfully downloaded {len(files)} files from {dataset['name']}"
-                    logger.info(log_msg)
-                    info_content.append(f"  - {log_msg}")
-                    info_content.append(f"    Output file: {unique_filename}.laz")
-                else:
-                    log_msg = f"No data downloaded from {dataset['name']}"
-                    logger.warning(log_msg)
-                    info_content.append(f"  - {log_msg}")
-            
+            for dataset_name, file_count in files_per_dataset.items():
+                info_content.append(f"  - {dataset_name}: {file_count} files")
+        elif downloaded_files:
             # Add summary about individual files
-            if downloaded_files:
-                info_content.append(f"")
-                info_content.append(f"Each dataset was downloaded to a separate file.")
+            info_content.append(f"")
+            info_content.append(f"Each dataset was downloaded to a separate file.")
         
         # When using --most-recent, no merging is needed - we only downloaded from one dataset
         
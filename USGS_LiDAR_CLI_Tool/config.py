@@ -8,18 +8,73 @@ Handles loading and validation of configuration settings.
 import os
 import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Default location for cached catalog and metadata files
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join("~", ".cache")),
+    "usgs_lidar_cli"
+)
+
 DEFAULT_CONFIG = {
     "tile_size": 1000,  # meters
+    "tile_max_points": None,  # split tiles with more estimated EPT points than this, None disables
+    "tile_min_size": 100,  # meters, smallest tile produced by density splitting
+    "tile_buffer": None,  # meters read around each tile for SMRF/outlier filtering, None derives it from the filters
+    "tiled": False,  # process each dataset as parallel tiles
+    "tile_workers": None,  # None means one worker per CPU
+    "tile_retries": 1,  # extra attempts for a failed tile
+    "merge_tiles": True,  # merge tile outputs into one LAZ per dataset
+    "merge_format": "laz",  # "laz" or "copc" (written by PDAL) for merged tiles
+    "merge_engine": "auto",  # "auto" (laspy, then pdal merge without merge_dedup), "laspy" or "pdal" (needs merge_dedup off)
+    "merge_dedup": True,  # drop points duplicated across tile edges when merging (laspy only)
     "resolution": None,  # None means native/full resolution
     "download_workers": 8,
+    "cpu_workers": None,  # PDAL pipelines running at once across all downloads, None means one per CPU
+    "max_http_requests": 64,  # in-flight HTTP requests to S3 across all downloads
+    "max_bandwidth_mbps": None,  # aggregate MB/s for EPT data fetched by the tool, None means unlimited
+    "ept_reader_threads": 4,  # fetch threads (and HTTP slots) per readers.ept pipeline
+    "http_pool_size": 32,  # pooled connections for EPT metadata requests
+    "http_retries": 3,  # retries for failed EPT metadata requests
+    "http_backoff": 0.5,  # exponential backoff factor between retries, in seconds
+    "http_timeout": 30,  # seconds per EPT metadata request
     "min_points": 100,
-    "region": "us-west-2"
+    "add_year": False,  # tag points with the dataset year
+    "year_tagging": "pipeline",  # "pipeline" (inside PDAL), "rewrite" (chunked laspy rewrite) or "vlr" (header VLR only)
+    "year_chunk_size": 1000000,  # points per chunk for the "rewrite" mode
+    "region": "us-west-2",
+    "pdal_engine": "auto",  # "auto", "python" (PDAL bindings) or "subprocess" (pdal command)
+    "stream_mode": "auto",  # "auto" streams pipelines with only streamable stages, "never" disables it
+    "stream_chunk_size": 10000,  # points per chunk in stream mode
+    "cache_dir": None,  # None means DEFAULT_CACHE_DIR
+    "boundaries_cache_ttl": 86400,  # seconds before revalidating the boundaries file
+    "ept_cache_size": 268435456,  # bytes of ept.json/hierarchy documents cached on disk, 0 disables
+    "ept_node_cache": False,  # mirror the EPT nodes of each download into the cache directory
+    "ept_node_cache_size": 10737418240,  # bytes of EPT nodes kept in the node cache
+    "ept_mirror": None,  # base URL or directory of an EPT mirror/caching proxy replacing S3, <base>/<dataset>/ept.json
+    "catalog_backend": "geojson",  # "geojson", "gpkg" (local GeoPackage) or "parquet" (GeoParquet)
+    "catalog_gpkg": None,  # None means the bundled usgs_lidar_boundaries.gpkg
+    "catalog_parquet": None  # None means catalog.parquet in the cache directory
 }
 
+# Supported PDAL execution engines
+PDAL_ENGINES = ("auto", "python", "subprocess")
+
+# Supported Year tagging modes
+YEAR_TAGGING_MODES = ("pipeline", "rewrite", "vlr")
+
+# Supported merged tile formats and merge engines
+MERGE_FORMATS = ("laz", "copc")
+MERGE_ENGINES = ("auto", "laspy", "pdal")
+
+# Supported stream mode settings
+STREAM_MODES = ("auto", "never")
+
+# Supported dataset catalog backends
+CATALOG_BACKENDS = ("geojson", "gpkg", "parquet")
+
 
 def load_config(config_path: str) -> Dict[str, Any]:
     """
@@ -82,6 +137,28 @@ def validate_config(config: Dict[str, Any]) -> Dict[str, Any]:
             logger.warning("Invalid tile_size value. Using default value.")
             config["tile_size"] = DEFAULT_CONFIG["tile_size"]
     
+    # Ensure tile_workers is a positive integer (None means one per CPU)
+    if "tile_workers" in config and config["tile_workers"] is not None:
+        try:
+            config["tile_workers"] = int(config["tile_workers"])
+            if config["tile_workers"] <= 0:
+                logger.warning("Invalid tile_workers (must be positive). Using one worker per CPU.")
+                config["tile_workers"] = None
+        except (ValueError, TypeError):
+            logger.warning("Invalid tile_workers value. Using one worker per CPU.")
+            config["tile_workers"] = None
+    
+    # Ensure tile_retries is a non-negative integer
+    if "tile_retries" in config:
+        try:
+            config["tile_retries"] = int(config["tile_retries"])
+            if config["tile_retries"] < 0:
+                logger.warning("Invalid tile_retries (must be non-negative). Using default value.")
+                config["tile_retries"] = DEFAULT_CONFIG["tile_retries"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid tile_retries value. Using default value.")
+            config["tile_retries"] = DEFAULT_CONFIG["tile_retries"]
+    
     # Validate resolution
     if "resolution" in config and config["resolution"] is not None:
         if config["resolution"] != "full":
@@ -119,4 +196,236 @@ def validate_config(config: Dict[str, Any]) -> Dict[str, Any]:
             logger.warning("Invalid min_points value. Using default value.")
             config["min_points"] = DEFAULT_CONFIG["min_points"]
     
+    # Ensure cache_dir is a string path (None means use the default location)
+    if "cache_dir" in config and config["cache_dir"] is not None:
+        if not isinstance(config["cache_dir"], str) or not config["cache_dir"].strip():
+            logger.warning("Invalid cache_dir value. Using default cache directory.")
+            config["cache_dir"] = None
+    
+    # Ensure cpu_workers is None or a positive integer
+    if config.get("cpu_workers") is not None:
+        try:
+            config["cpu_workers"] = int(config["cpu_workers"])
+            if config["cpu_workers"] <= 0:
+                logger.warning("Invalid cpu_workers (must be positive). Using default value.")
+                config["cpu_workers"] = DEFAULT_CONFIG["cpu_workers"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid cpu_workers value. Using default value.")
+            config["cpu_workers"] = DEFAULT_CONFIG["cpu_workers"]
+    
+    # Ensure max_http_requests is a positive integer
+    if "max_http_requests" in config:
+        try:
+            config["max_http_requests"] = int(config["max_http_requests"])
+            if config["max_http_requests"] <= 0:
+                logger.warning("Invalid max_http_requests (must be positive). Using default value.")
+                config["max_http_requests"] = DEFAULT_CONFIG["max_http_requests"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid max_http_requests value. Using default value.")
+            config["max_http_requests"] = DEFAULT_CONFIG["max_http_requests"]
+    
+    # Ensure max_bandwidth_mbps is None or a positive number
+    if config.get("max_bandwidth_mbps") is not None:
+        try:
+            config["max_bandwidth_mbps"] = float(config["max_bandwidth_mbps"])
+            if config["max_bandwidth_mbps"] <= 0:
+                logger.warning("Invalid max_bandwidth_mbps (must be positive). Using default value.")
+                config["max_bandwidth_mbps"] = DEFAULT_CONFIG["max_bandwidth_mbps"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid max_bandwidth_mbps value. Using default value.")
+            config["max_bandwidth_mbps"] = DEFAULT_CONFIG["max_bandwidth_mbps"]
+    
+    # Ensure ept_reader_threads is a positive integer
+    if "ept_reader_threads" in config:
+        try:
+            config["ept_reader_threads"] = int(config["ept_reader_threads"])
+            if config["ept_reader_threads"] <= 0:
+                logger.warning("Invalid ept_reader_threads (must be positive). Using default value.")
+                config["ept_reader_threads"] = DEFAULT_CONFIG["ept_reader_threads"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid ept_reader_threads value. Using default value.")
+            config["ept_reader_threads"] = DEFAULT_CONFIG["ept_reader_threads"]
+    
+    # Ensure tile_max_points is None or a positive integer
+    if config.get("tile_max_points") is not None:
+        try:
+            config["tile_max_points"] = int(config["tile_max_points"])
+            if config["tile_max_points"] <= 0:
+                logger.warning("Invalid tile_max_points (must be positive). Using default value.")
+                config["tile_max_points"] = DEFAULT_CONFIG["tile_max_points"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid tile_max_points value. Using default value.")
+            config["tile_max_points"] = DEFAULT_CONFIG["tile_max_points"]
+    
+    # Ensure tile_min_size is a positive number of meters
+    if "tile_min_size" in config:
+        try:
+            config["tile_min_size"] = float(config["tile_min_size"])
+            if config["tile_min_size"] <= 0:
+                logger.warning("Invalid tile_min_size (must be positive). Using default value.")
+                config["tile_min_size"] = DEFAULT_CONFIG["tile_min_size"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid tile_min_size value. Using default value.")
+            config["tile_min_size"] = DEFAULT_CONFIG["tile_min_size"]
+    
+    # Ensure tile_buffer is None or a non-negative number of meters
+    if config.get("tile_buffer") is not None:
+        try:
+            config["tile_buffer"] = float(config["tile_buffer"])
+            if config["tile_buffer"] < 0:
+                logger.warning("Invalid tile_buffer (must be non-negative). Using default value.")
+                config["tile_buffer"] = DEFAULT_CONFIG["tile_buffer"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid tile_buffer value. Using default value.")
+            config["tile_buffer"] = DEFAULT_CONFIG["tile_buffer"]
+    
+    # Ensure http_pool_size is a positive integer
+    if "http_pool_size" in config:
+        try:
+            config["http_pool_size"] = int(config["http_pool_size"])
+            if config["http_pool_size"] <= 0:
+                logger.warning("Invalid http_pool_size (must be positive). Using default value.")
+                config["http_pool_size"] = DEFAULT_CONFIG["http_pool_size"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid http_pool_size value. Using default value.")
+            config["http_pool_size"] = DEFAULT_CONFIG["http_pool_size"]
+    
+    # Ensure http_retries is a non-negative integer
+    if "http_retries" in config:
+        try:
+            config["http_retries"] = int(config["http_retries"])
+            if config["http_retries"] < 0:
+                logger.warning("Invalid http_retries (must be non-negative). Using default value.")
+                config["http_retries"] = DEFAULT_CONFIG["http_retries"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid http_retries value. Using default value.")
+            config["http_retries"] = DEFAULT_CONFIG["http_retries"]
+    
+    # Ensure http_backoff is a non-negative number of seconds
+    if "http_backoff" in config:
+        try:
+            config["http_backoff"] = float(config["http_backoff"])
+            if config["http_backoff"] < 0:
+                logger.warning("Invalid http_backoff (must be non-negative). Using default value.")
+                config["http_backoff"] = DEFAULT_CONFIG["http_backoff"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid http_backoff value. Using default value.")
+            config["http_backoff"] = DEFAULT_CONFIG["http_backoff"]
+    
+    # Ensure http_timeout is a positive number of seconds
+    if "http_timeout" in config:
+        try:
+            config["http_timeout"] = float(config["http_timeout"])
+            if config["http_timeout"] <= 0:
+                logger.warning("Invalid http_timeout (must be positive). Using default value.")
+                config["http_timeout"] = DEFAULT_CONFIG["http_timeout"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid http_timeout value. Using default value.")
+            config["http_timeout"] = DEFAULT_CONFIG["http_timeout"]
+    
+    # Ensure boundaries_cache_ttl is a non-negative number of seconds
+    if "boundaries_cache_ttl" in config:
+        try:
+            config["boundaries_cache_ttl"] = float(config["boundaries_cache_ttl"])
+            if config["boundaries_cache_ttl"] < 0:
+                logger.warning("Invalid boundaries_cache_ttl (must be non-negative). Using default value.")
+                config["boundaries_cache_ttl"] = DEFAULT_CONFIG["boundaries_cache_ttl"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid boundaries_cache_ttl value. Using default value.")
+            config["boundaries_cache_ttl"] = DEFAULT_CONFIG["boundaries_cache_ttl"]
+    
+    # Ensure ept_cache_size is a non-negative number of bytes
+    if "ept_cache_size" in config:
+        try:
+            config["ept_cache_size"] = int(config["ept_cache_size"])
+            if config["ept_cache_size"] < 0:
+                logger.warning("Invalid ept_cache_size (must be non-negative). Using default value.")
+                config["ept_cache_size"] = DEFAULT_CONFIG["ept_cache_size"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid ept_cache_size value. Using default value.")
+            config["ept_cache_size"] = DEFAULT_CONFIG["ept_cache_size"]
+    
+    # Ensure ept_node_cache_size is a positive number of bytes
+    if "ept_node_cache_size" in config:
+        try:
+            config["ept_node_cache_size"] = int(config["ept_node_cache_size"])
+            if config["ept_node_cache_size"] <= 0:
+                logger.warning("Invalid ept_node_cache_size (must be positive). Using default value.")
+                config["ept_node_cache_size"] = DEFAULT_CONFIG["ept_node_cache_size"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid ept_node_cache_size value. Using default value.")
+            config["ept_node_cache_size"] = DEFAULT_CONFIG["ept_node_cache_size"]
+    
+    # Ensure pdal_engine is a supported engine
+    if "pdal_engine" in config:
+        if config["pdal_engine"] not in PDAL_ENGINES:
+            logger.warning(f"Invalid pdal_engine (must be one of {', '.join(PDAL_ENGINES)}). Using default value.")
+            config["pdal_engine"] = DEFAULT_CONFIG["pdal_engine"]
+    
+    # Ensure year_tagging is a supported mode
+    if "year_tagging" in config:
+        if config["year_tagging"] not in YEAR_TAGGING_MODES:
+            logger.warning(f"Invalid year_tagging (must be one of {', '.join(YEAR_TAGGING_MODES)}). Using default value.")
+            config["year_tagging"] = DEFAULT_CONFIG["year_tagging"]
+    
+    # Ensure year_chunk_size is a positive integer
+    if "year_chunk_size" in config:
+        try:
+            config["year_chunk_size"] = int(config["year_chunk_size"])
+            if config["year_chunk_size"] <= 0:
+                logger.warning("Invalid year_chunk_size (must be positive). Using default value.")
+                config["year_chunk_size"] = DEFAULT_CONFIG["year_chunk_size"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid year_chunk_size value. Using default value.")
+            config["year_chunk_size"] = DEFAULT_CONFIG["year_chunk_size"]
+    
+    # Ensure merge_format is a supported format
+    if "merge_format" in config:
+        if config["merge_format"] not in MERGE_FORMATS:
+            logger.warning(f"Invalid merge_format (must be one of {', '.join(MERGE_FORMATS)}). Using default value.")
+            config["merge_format"] = DEFAULT_CONFIG["merge_format"]
+    
+    # Ensure merge_engine is a supported engine
+    if "merge_engine" in config:
+        if config["merge_engine"] not in MERGE_ENGINES:
+            logger.warning(f"Invalid merge_engine (must be one of {', '.join(MERGE_ENGINES)}). Using default value.")
+            config["merge_engine"] = DEFAULT_CONFIG["merge_engine"]
+    
+    # Ensure stream_mode is a supported setting
+    if "stream_mode" in config:
+        if config["stream_mode"] not in STREAM_MODES:
+            logger.warning(f"Invalid stream_mode (must be one of {', '.join(STREAM_MODES)}). Using default value.")
+            config["stream_mode"] = DEFAULT_CONFIG["stream_mode"]
+    
+    # Ensure stream_chunk_size is a positive integer
+    if "stream_chunk_size" in config:
+        try:
+            config["stream_chunk_size"] = int(config["stream_chunk_size"])
+            if config["stream_chunk_size"] <= 0:
+                logger.warning("Invalid stream_chunk_size (must be positive). Using default value.")
+                config["stream_chunk_size"] = DEFAULT_CONFIG["stream_chunk_size"]
+        except (ValueError, TypeError):
+            logger.warning("Invalid stream_chunk_size value. Using default value.")
+            config["stream_chunk_size"] = DEFAULT_CONFIG["stream_chunk_size"]
+    
+    # Ensure catalog_backend is a supported backend
+    if "catalog_backend" in config:
+        if config["catalog_backend"] not in CATALOG_BACKENDS:
+            logger.warning(f"Invalid catalog_backend (must be one of {', '.join(CATALOG_BACKENDS)}). Using default value.")
+            config["catalog_backend"] = DEFAULT_CONFIG["catalog_backend"]
+    
     return config
+
+
+def get_cache_dir(config: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Resolve the cache directory from the configuration.
+    
+    Args:
+        config: Optional configuration dictionary
+        
+    Returns:
+        str: Absolute path to the cache directory
+    """
+    cache_dir = (config or {}).get("cache_dir") or DEFAULT_CACHE_DIR
+    return os.path.abspath(os.path.expanduser(cache_dir))
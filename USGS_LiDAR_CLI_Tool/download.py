@@ -8,20 +8,65 @@ in Entwine Point Tile (EPT) format using PDAL pipelines.
 
 import os
 import sys
+import copy
 import json
-import time
+import base64
+import struct
+import shutil
 import logging
-import tempfile
 import subprocess
 import concurrent.futures
+from contextlib import contextmanager
 from pathlib import Path
 import io
 import numpy as np
-from typing import List, Dict, Any, Optional, Union, Tuple
+from typing import List, Dict, Any, Optional, Union, Tuple, Iterator
+import geopandas as gpd
+from shapely.geometry import shape, mapping, box
+from shapely.ops import unary_union
+
+from .boundaries import boundary_geometry
+from .ept import fetch_ept_json, load_point_density, mirror_ept_dataset, plan_ept_download, release_ept_mirror
+from .scheduler import get_scheduler
+from .manifest import JobManifest, STATUS_COMPLETE, STATUS_FAILED, pipeline_hash
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
+# Stages that support PDAL stream mode
+STREAMABLE_STAGES = {
+    "readers.ept",
+    "readers.las",
+    "filters.reprojection",
+    "filters.assign",
+    "filters.ferry",
+    "filters.range",
+    "filters.crop",
+    "writers.las",
+}
+
+# SMRF window size in meters (also the tile buffer needed for ground classification)
+SMRF_WINDOW = 18.0
+
+# Points per chunk when rewriting LAZ files with laspy
+DEFAULT_YEAR_CHUNK_SIZE = 1_000_000
+
+# VLR identifying the acquisition year written by this tool
+YEAR_VLR_USER_ID = "USGS_LiDAR_CLI"
+YEAR_VLR_RECORD_ID = 1
+
+# Bytes needed to cover the public header of any LAS version (1.4 is the largest)
+LAS_HEADER_READ_SIZE = 375
+
+# Size of a VLR header (reserved, user ID, record ID, record length, description)
+LAS_VLR_HEADER_SIZE = 54
+
+# LASzip VLR; compressors 2 and 3 are chunked and store the absolute offset of
+# the chunk table in the first 8 bytes of the point data
+LASZIP_VLR_USER_ID = "laszip encoded"
+LASZIP_VLR_RECORD_ID = 22204
+LASZIP_CHUNKED_COMPRESSORS = (2, 3)
+
 # Debug Python environment
 logger.info(f"Python executable: {sys.executable}")
 logger.info(f"Python version: {sys.version}")
@@ -37,40 +82,58 @@ except ImportError as e:
     logger.warning(f"laspy import failed: {e}")
     logger.warning("laspy not installed, Year dimension will not be added to LiDAR data")
 
+# Try to import the PDAL Python bindings - used to run pipelines in-process
+try:
+    import pdal
+    PDAL_PYTHON_AVAILABLE = True
+    logger.info(f"pdal bindings imported successfully from: {pdal.__file__}")
+except ImportError as e:
+    PDAL_PYTHON_AVAILABLE = False
+    logger.info(f"pdal bindings not available ({e}), pipelines will run through the pdal command")
 
-def add_year_to_laz(input_file: str, output_file: str, year: int) -> bool:
+
+def add_year_to_laz(input_file: str, output_file: str, year: int,
+                    chunk_size: int = DEFAULT_YEAR_CHUNK_SIZE) -> bool:
     """
     Add Year information to a LAZ file using laspy.
     
+    Points are streamed through in chunks of ``chunk_size`` points, so memory
+    use stays constant regardless of the file size.
+    
     Args:
         input_file: Path to the input LAZ file
         output_file: Path to the output LAZ file with Year information
         year: Year value to add (as integer)
+        chunk_size: Number of points read and written at a time
         
     Returns:
         bool: True if successful, False otherwise
     """
-    import os  # Ensure os is imported at the beginning of the function
-    
     if not LASPY_AVAILABLE:
         logger.warning("laspy not available, Year dimension cannot be added")
         return False
     
+    if is_copc_file(input_file):
+        # Rewriting the points would silently turn the file into plain LAZ
+        logger.error(f"Cannot add a Year dimension to COPC file {input_file}, use the 'pipeline' Year tagging mode")
+        return False
+    
     # Handle case where input and output are the same file
     if input_file == output_file:
-        temp_output = f"{output_file}.temp.laz"
+        # Keep the extension, laspy compresses the output based on it
+        temp_output = f"{output_file}.temp{os.path.splitext(output_file)[1] or '.laz'}"
         logger.info(f"Input and output files are the same, using temporary file: {temp_output}")
-        result = add_year_to_laz(input_file, temp_output, year)
+        result = add_year_to_laz(input_file, temp_output, year, chunk_size)
         if result:
             try:
-                if os.path.exists(output_file):
-                    os.remove(output_file)
-                os.rename(temp_output, output_file)
+                os.replace(temp_output, output_file)
                 return True
             except Exception as e:
                 logger.error(f"Error renaming temporary file: {str(e)}")
                 import traceback
                 logger.error(traceback.format_exc())
+                if os.path.exists(temp_output):
+                    os.remove(temp_output)
                 return False
         return False
         
@@ -79,96 +142,298 @@ def add_year_to_laz(input_file: str, output_file: str, year: int) -> bool:
         if not os.path.exists(input_file):
             logger.error(f"Input file does not exist: {input_file}")
             return False
+        
+        # Ensure the output directory exists
+        output_dir = os.path.dirname(output_file)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
             
         # Open the LAZ file
         with laspy.open(input_file) as in_file:
-            las = in_file.read()
+            # Copy the header (scales, offsets, VLRs and point format) for the output
+            new_header = copy.deepcopy(in_file.header)
             
-            # Create a new LasData object with the same header and point data
-            # Create a copy of the header
-            new_header = laspy.LasHeader(
-                version=las.header.version,
-                point_format=las.header.point_format
-            )
+            # Add Year dimension if it doesn't exist
+            add_dimension = 'Year' not in new_header.point_format.dimension_names
+            if add_dimension:
+                new_header.add_extra_dim(laspy.ExtraBytesParams(
+                    name="Year",
+                    type=np.uint16,  # Use unsigned 16-bit int for years
+                    description=f"Acquisition year: {year}"
+                ))
             
-            # Copy header attributes from the original
-            for attr_name in dir(las.header):
-                if not attr_name.startswith('_') and attr_name not in ['version', 'point_format']:
-                    try:
-                        attr_value = getattr(las.header, attr_name)
-                        if not callable(attr_value):
-                            setattr(new_header, attr_name, attr_value)
-                    except:
-                        pass
+            # Add a custom VLR with year information
+            new_header.vlrs.append(laspy.vlrs.VLR(
+                user_id=YEAR_VLR_USER_ID,
+                record_id=YEAR_VLR_RECORD_ID,  # Custom record ID for Year
+                description=f"Acquisition Year: {year}",
+                record_data=f"Year: {year}".encode('utf-8')
+            ))
             
-            # Create a new LasData with the copied header
-            output_las = laspy.LasData(new_header)
+            # Stream the points chunk by chunk into the output file
+            with laspy.open(output_file, mode="w", header=new_header) as out_file:
+                for chunk in in_file.chunk_iterator(chunk_size):
+                    points = laspy.ScaleAwarePointRecord.zeros(len(chunk), header=new_header)
+                    for dim_name in chunk.point_format.dimension_names:
+                        points[dim_name] = chunk[dim_name]
+                    if add_dimension:
+                        points['Year'] = np.full(len(points), year, np.uint16)
+                    out_file.write_points(points)
             
-            # Copy all points from the original
-            for dim_name in las.point_format.dimension_names:
-                try:
-                    output_las[dim_name] = las[dim_name]
-                except Exception as e:
-                    logger.warning(f"Could not copy dimension {dim_name}: {str(e)}")
+        # Verify the file was created
+        if not os.path.exists(output_file):
+            logger.error(f"Failed to create output file: {output_file}")
+            return False
+        
+        logger.info(f"Added Year {year} as dimension and VLR to file")
+        return True
             
-            # Add Year dimension if it doesn't exist
-            if 'Year' not in output_las.point_format.dimension_names:
-                try:
-                    # Add Year as extra dimension
-                    output_las.add_extra_dim(laspy.ExtraBytesParams(
-                        name="Year",
-                        type=np.uint16,  # Use unsigned 16-bit int for years
-                        description=f"Acquisition year: {year}"
-                    ))
-                    # Fill the Year dimension with the year value
-                    output_las.Year[:] = year
-                    logger.info(f"Added Year dimension to output file")
-                except Exception as e:
-                    logger.warning(f"Could not add Year dimension: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error adding Year to LAZ file: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        # Do not leave a partially written file behind
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        return False
+
+
+def _vlr_user_id(vlr: bytes) -> str:
+    """Return the user ID of a raw VLR record."""
+    return vlr[2:18].split(b"\0", 1)[0].decode("ascii", errors="replace")
+
+
+def is_copc_file(path: str) -> bool:
+    """
+    Check whether a LAS/LAZ file is a COPC file.
+    
+    COPC files start their VLRs with the COPC info VLR.
+    
+    Args:
+        path: Path to the LAS/LAZ file
+        
+    Returns:
+        bool: True if the file is COPC, False otherwise or if it cannot be read
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(LAS_HEADER_READ_SIZE)
+            if len(header) < 104 or header[:4] != b"LASF":
+                return False
+            header_size, _, vlr_count = struct.unpack_from("<HII", header, 94)
+            if not vlr_count:
+                return False
+            f.seek(header_size)
+            return _vlr_user_id(f.read(LAS_VLR_HEADER_SIZE)) == "copc"
+    except OSError:
+        return False
+
+
+def set_year_vlr(input_file: str, output_file: str, year: int) -> bool:
+    """
+    Add or update the Year VLR of a LAS/LAZ file without touching point records.
+    
+    Only the header and VLR block are rewritten; the (compressed) point data,
+    LASzip chunk table and EVLRs are copied byte-for-byte, with the absolute
+    offsets that point into them (including a chunk table offset stored at
+    the end of the file) shifted by the change in VLR size. This makes
+    tagging cost O(header) instead of O(points). Points get no Year dimension.
+    
+    Args:
+        input_file: Path to the input LAS/LAZ file
+        output_file: Path to the output LAS/LAZ file
+        year: Year value to record
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    # Handle case where input and output are the same file
+    if input_file == output_file:
+        temp_output = f"{output_file}.temp.laz"
+        result = set_year_vlr(input_file, temp_output, year)
+        if result:
+            try:
+                os.replace(temp_output, output_file)
+                return True
+            except Exception as e:
+                logger.error(f"Error renaming temporary file: {str(e)}")
+                return False
+        return False
+    
+    try:
+        with open(input_file, "rb") as src:
+            header = bytearray(src.read(LAS_HEADER_READ_SIZE))
+            if len(header) < 227 or header[:4] != b"LASF":
+                logger.error(f"Not a LAS/LAZ file: {input_file}")
+                return False
             
-            # Add a custom VLR with year information
-            vlr_data = f"Year: {year}".encode('utf-8')
+            major, minor = header[24], header[25]
+            header_size, point_offset, vlr_count = struct.unpack_from("<HII", header, 94)
+            src.seek(0)
+            header = bytearray(src.read(header_size))
             
-            # Create a custom VLR
-            vlr = laspy.vlrs.VLR(
-                user_id="USGS_LiDAR_CLI",
-                record_id=1,  # Custom record ID for Year
-                description=f"Acquisition Year: {year}",
-                record_data=vlr_data
-            )
+            # Split the VLR block into records, keeping any padding before the points
+            src.seek(header_size)
+            vlr_block = src.read(point_offset - header_size)
+            vlrs = []
+            position = 0
+            for _ in range(vlr_count):
+                record_length = struct.unpack_from("<H", vlr_block, position + 20)[0]
+                end = position + LAS_VLR_HEADER_SIZE + record_length
+                vlrs.append(vlr_block[position:end])
+                position = end
+            padding = vlr_block[position:]
+            
+            if any(_vlr_user_id(vlr) == "copc" for vlr in vlrs):
+                # COPC requires its info VLR at a fixed position and stores
+                # absolute hierarchy offsets inside it
+                logger.error(f"Cannot rewrite VLRs of COPC file {input_file}")
+                return False
+            
+            chunked = False
+            for vlr in vlrs:
+                if (_vlr_user_id(vlr) == LASZIP_VLR_USER_ID
+                        and struct.unpack_from("<H", vlr, 18)[0] == LASZIP_VLR_RECORD_ID):
+                    compressor = struct.unpack_from("<H", vlr, LAS_VLR_HEADER_SIZE)[0]
+                    chunked = compressor in LASZIP_CHUNKED_COMPRESSORS
+            
+            # Replace any existing Year VLR with the new one
+            vlrs = [
+                vlr for vlr in vlrs
+                if not (_vlr_user_id(vlr) == YEAR_VLR_USER_ID
+                        and struct.unpack_from("<H", vlr, 18)[0] == YEAR_VLR_RECORD_ID)
+            ]
+            record_data = f"Year: {year}".encode("utf-8")
+            vlrs.append(struct.pack(
+                "<H16sHH32s", 0, YEAR_VLR_USER_ID.encode("ascii"), YEAR_VLR_RECORD_ID,
+                len(record_data), f"Acquisition Year: {year}".encode("ascii")
+            ) + record_data)
+            
+            new_vlr_block = b"".join(vlrs) + padding
+            shift = len(new_vlr_block) - len(vlr_block)
             
-            # Copy existing VLRs and add the new one
-            for existing_vlr in las.vlrs:
-                output_las.vlrs.append(existing_vlr)
-            output_las.vlrs.append(vlr)
+            struct.pack_into("<II", header, 96, point_offset + shift, len(vlrs))
+            # Waveform data (LAS 1.3+) and EVLR (LAS 1.4) offsets are absolute
+            if (major, minor) >= (1, 3):
+                waveform_offset = struct.unpack_from("<Q", header, 227)[0]
+                if waveform_offset:
+                    struct.pack_into("<Q", header, 227, waveform_offset + shift)
+            if (major, minor) >= (1, 4):
+                evlr_offset = struct.unpack_from("<Q", header, 235)[0]
+                if evlr_offset:
+                    struct.pack_into("<Q", header, 235, evlr_offset + shift)
             
-            # Ensure the output directory exists
             output_dir = os.path.dirname(output_file)
             if output_dir and not os.path.exists(output_dir):
                 os.makedirs(output_dir, exist_ok=True)
             
-            # Write the modified file
-            output_las.write(output_file)
-            
-            # Verify the file was created
-            if not os.path.exists(output_file):
-                logger.error(f"Failed to create output file: {output_file}")
-                return False
-                
-            logger.info(f"Added Year {year} as VLR to file")
-            return True
-            
+            with open(output_file, "wb") as dst:
+                dst.write(header)
+                dst.write(new_vlr_block)
+                src.seek(point_offset)
+                trailing_offset = None
+                if chunked:
+                    chunk_table_offset = struct.unpack("<q", src.read(8))[0]
+                    if chunk_table_offset == -1:
+                        # Writers that cannot seek back store the offset in the last 8 bytes instead
+                        src.seek(-8, os.SEEK_END)
+                        trailing_offset = struct.unpack("<q", src.read(8))[0] + shift
+                        src.seek(point_offset + 8)
+                    else:
+                        chunk_table_offset += shift
+                    dst.write(struct.pack("<q", chunk_table_offset))
+                shutil.copyfileobj(src, dst, 16 * 1024 * 1024)
+                if trailing_offset is not None:
+                    dst.seek(-8, os.SEEK_END)
+                    dst.write(struct.pack("<q", trailing_offset))
+        
+        logger.info(f"Set Year {year} VLR in {output_file}")
+        return True
+    
     except Exception as e:
-        logger.error(f"Error adding Year to LAZ file: {str(e)}")
+        logger.error(f"Error setting Year VLR: {str(e)}")
         import traceback
         logger.error(traceback.format_exc())
         return False
 
 
+def get_year_tagging(dataset: Dict[str, Any], config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Get the Year tagging applied to the output files after the pipeline has run.
+    
+    Used in manifest hashes, since the post-processing modes change the
+    outputs without changing the PDAL pipeline.
+    
+    Args:
+        dataset: Dataset information dictionary
+        config: Configuration dictionary
+        
+    Returns:
+        dict: 'mode' and 'year', or None when no post-processing tagging is done
+    """
+    if not config.get('add_year') or config.get('year_tagging', 'pipeline') == 'pipeline':
+        return None
+    year = get_dataset_year(dataset)
+    if year is None:
+        return None
+    return {'mode': config.get('year_tagging'), 'year': year}
+
+
+def job_hash(job: Any, dataset: Dict[str, Any], config: Dict[str, Any]) -> str:
+    """
+    Hash a job description for the manifest, including the post-processing Year tagging.
+    
+    Args:
+        job: PDAL pipeline or other JSON-serializable job description
+        dataset: Dataset information dictionary
+        config: Configuration dictionary
+        
+    Returns:
+        str: Hash of the job
+    """
+    year_tagging = get_year_tagging(dataset, config)
+    if year_tagging is None:
+        return pipeline_hash(job)
+    return pipeline_hash({'job': job, 'year_tagging': year_tagging})
+
+
+def apply_year_tagging(files: List[str], dataset: Dict[str, Any], config: Dict[str, Any]) -> bool:
+    """
+    Tag finished output files with the dataset year after the pipeline has run.
+    
+    Does nothing unless ``add_year`` is enabled with a post-processing
+    ``year_tagging`` mode; the default 'pipeline' mode tags points inside the
+    PDAL pipeline instead.
+    
+    Args:
+        files: Output LAZ files of the dataset
+        dataset: Dataset information dictionary
+        config: Configuration dictionary
+        
+    Returns:
+        bool: True if every file was tagged (or no tagging was needed), False otherwise
+    """
+    if not config.get('add_year') or config.get('year_tagging', 'pipeline') == 'pipeline':
+        return True
+    
+    year = get_dataset_year(dataset)
+    if year is None:
+        logger.warning(f"Dataset {dataset.get('name', 'unknown')} has no year, skipping Year tagging")
+        return True
+    
+    if config.get('year_tagging') == 'vlr':
+        return all(set_year_vlr(laz_file, laz_file, year) for laz_file in files)
+    
+    chunk_size = config.get('year_chunk_size', DEFAULT_YEAR_CHUNK_SIZE)
+    return all(add_year_to_laz(laz_file, laz_file, year, chunk_size) for laz_file in files)
+
+
 def get_ept_bounds(ept_url: str) -> Optional[List[float]]:
     """
     Get bounds of an EPT dataset by downloading and parsing the ept.json file.
     
+    The file is fetched with the shared HTTP session and parsed in memory.
+    
     Args:
         ept_url: URL to the EPT dataset
         
@@ -178,58 +443,37 @@ def get_ept_bounds(ept_url: str) -> Optional[List[float]]:
     try:
         logger.info(f"Fetching EPT metadata from {ept_url}")
         
-        # Create a temporary file to store the ept.json content
-        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as temp_file:
-            try:
-                # Download the file using curl command
-                cmd = ["curl", "-s", ept_url]
-                result = subprocess.run(cmd, capture_output=True, check=True)
-                
-                if result.returncode != 0:
-                    logger.error(f"Error downloading EPT metadata: {result.stderr.decode()}")
-                    return None
-                
-                # Write the content to the temporary file
-                temp_file.write(result.stdout)
-                temp_file.flush()
-                
-                # Parse the JSON file
-                with open(temp_file.name, 'r') as f:
-                    ept_data = json.load(f)
-                
-                # Extract bounds from the ept.json file
-                if 'bounds' in ept_data:
-                    bounds = ept_data['bounds']
-                    # Handle different bounds formats
-                    if isinstance(bounds, list):
-                        if len(bounds) >= 6:
-                            # Standard format with XYZ min/max: [xmin, ymin, zmin, xmax, ymax, zmax]
-                            return [
-                                bounds[0], bounds[1],  # minx, miny
-                                bounds[3], bounds[4]   # maxx, maxy
-                            ]
-                        elif len(bounds) >= 4:
-                            # XY min/max only: [xmin, ymin, xmax, ymax]
-                            return bounds[:4]
-                    elif isinstance(bounds, dict):
-                        # Dictionary format with explicit keys
-                        if all(k in bounds for k in ['minx', 'miny', 'maxx', 'maxy']):
-                            return [
-                                bounds['minx'], bounds['miny'],
-                                bounds['maxx'], bounds['maxy']
-                            ]
-                        # Handle cubic bounds format
-                        elif all(k in bounds for k in ['xmin', 'ymin', 'xmax', 'ymax']):
-                            return [
-                                bounds['xmin'], bounds['ymin'],
-                                bounds['xmax'], bounds['ymax']
-                            ]
-            finally:
-                # Clean up
-                try:
-                    os.unlink(temp_file.name)
-                except:
-                    pass
+        ept_data = fetch_ept_json(ept_url)
+        if ept_data is None:
+            return None
+        
+        # Extract bounds from the ept.json file
+        if 'bounds' in ept_data:
+            bounds = ept_data['bounds']
+            # Handle different bounds formats
+            if isinstance(bounds, list):
+                if len(bounds) >= 6:
+                    # Standard format with XYZ min/max: [xmin, ymin, zmin, xmax, ymax, zmax]
+                    return [
+                        bounds[0], bounds[1],  # minx, miny
+                        bounds[3], bounds[4]   # maxx, maxy
+                    ]
+                elif len(bounds) >= 4:
+                    # XY min/max only: [xmin, ymin, xmax, ymax]
+                    return bounds[:4]
+            elif isinstance(bounds, dict):
+                # Dictionary format with explicit keys
+                if all(k in bounds for k in ['minx', 'miny', 'maxx', 'maxy']):
+                    return [
+                        bounds['minx'], bounds['miny'],
+                        bounds['maxx'], bounds['maxy']
+                    ]
+                # Handle cubic bounds format
+                elif all(k in bounds for k in ['xmin', 'ymin', 'xmax', 'ymax']):
+                    return [
+                        bounds['xmin'], bounds['ymin'],
+                        bounds['xmax'], bounds['ymax']
+                    ]
         
         logger.error("Could not extract bounds from ept.json")
         return None
@@ -250,7 +494,10 @@ def create_pdal_pipeline(input_url: str, output_laz: str,
                         coordinate_reference_system: Optional[str] = None,
                         outlier_filter: bool = False,
                         outlier_mean_k: int = 12,
-                        outlier_multiplier: float = 2.2) -> Dict[str, Any]:
+                        outlier_multiplier: float = 2.2,
+                        bounds_srs: Optional[str] = None,
+                        year: Optional[int] = None,
+                        crop_bounds: Optional[List[float]] = None) -> Dict[str, Any]:
     """
     Create a PDAL pipeline definition for processing EPT data.
     
@@ -263,6 +510,11 @@ def create_pdal_pipeline(input_url: str, output_laz: str,
                or a numeric value in coordinate units (meters) to control point spacing. Lower values 
                create denser point clouds with more detail but larger files.
         classify_ground: Whether to apply SMRF ground classification
+        bounds_srs: Optional spatial reference of ``bounds`` (e.g. 'EPSG:32617'),
+               defaults to the SRS of the EPT dataset
+        year: Optional acquisition year written as a Year extra dimension and VLR
+        crop_bounds: Optional bounds (in ``bounds_srs``) the output is cropped to after
+               filtering, used to drop the buffer read around a tile
         
     Returns:
         dict: PDAL pipeline definition
@@ -275,11 +527,12 @@ def create_pdal_pipeline(input_url: str, output_laz: str,
     
     # If boundary_geojson is provided, use the polygon parameter for precise filtering
     if boundary_geojson:
-        # Extract geometry from the GeoJSON
+        # Extract geometry from the GeoJSON (all features of a FeatureCollection combined)
         geometry = None
         if boundary_geojson.get('type') == 'FeatureCollection':
-            if boundary_geojson.get('features') and len(boundary_geojson['features']) > 0:
-                geometry = boundary_geojson['features'][0].get('geometry')
+            combined = boundary_geometry(boundary_geojson)
+            if combined is not None:
+                geometry = mapping(combined)
         elif boundary_geojson.get('type') == 'Feature':
             geometry = boundary_geojson.get('geometry')
         elif boundary_geojson.get('type') in ['Polygon', 'MultiPolygon']:
@@ -288,9 +541,11 @@ def create_pdal_pipeline(input_url: str, output_laz: str,
         if geometry:
             # Convert to JSON string and use as polygon parameter
             reader["polygon"] = json.dumps(geometry)
-    # Fall back to bounds if no geometry is available
-    elif bounds:
+    # Limit to bounds (on their own, or together with the polygon for tiles)
+    if bounds:
         bounds_str = f"([{bounds[0]}, {bounds[2]}], [{bounds[1]}, {bounds[3]}])"
+        if bounds_srs:
+            bounds_str = f"{bounds_str}/{bounds_srs}"
         reader["bounds"] = bounds_str
     
     # Build the pipeline stages
@@ -332,7 +587,7 @@ def create_pdal_pipeline(input_url: str, output_laz: str,
         
         smrf_filter = {
             "type": "filters.smrf",
-            "window": 18.0,
+            "window": SMRF_WINDOW,
             "slope": 0.15,
             "threshold": 0.5,
             "ignore": "Classification[7:7]",
@@ -360,6 +615,28 @@ def create_pdal_pipeline(input_url: str, output_laz: str,
         
         logger.info(f"Added statistical outlier filter with mean_k={outlier_mean_k}, multiplier={outlier_multiplier}, removing outliers with classification filter")
     
+    # Crop buffered tiles back to their core after the neighborhood filters
+    if crop_bounds:
+        crop_filter = {
+            "type": "filters.crop",
+            "bounds": f"([{crop_bounds[0]}, {crop_bounds[2]}], [{crop_bounds[1]}, {crop_bounds[3]}])"
+        }
+        if bounds_srs:
+            crop_filter["a_srs"] = bounds_srs
+        pipeline_stages.append(crop_filter)
+    
+    # Tag every point with the acquisition year while the points are in the pipeline
+    if year is not None:
+        pipeline_stages.append({
+            "type": "filters.ferry",
+            "dimensions": "=>Year"
+        })
+        pipeline_stages.append({
+            "type": "filters.assign",
+            "value": f"Year = {year}"
+        })
+        logger.info(f"Added Year {year} dimension and VLR to pipeline")
+    
     # Add writer as the final stage
     writer = {
         "type": "writers.las",
@@ -367,6 +644,15 @@ def create_pdal_pipeline(input_url: str, output_laz: str,
         "minor_version": 4,
         "dataformat_id": 8
     }
+    if year is not None:
+        # Store Year as an extra-bytes dimension and add the same VLR as add_year_to_laz()
+        writer["extra_dims"] = "Year=uint16"
+        writer["vlrs"] = [{
+            "user_id": YEAR_VLR_USER_ID,
+            "record_id": YEAR_VLR_RECORD_ID,
+            "description": f"Acquisition Year: {year}",
+            "data": base64.b64encode(f"Year: {year}".encode('utf-8')).decode('ascii')
+        }]
     pipeline_stages.append(writer)
     
     # Create the pipeline
@@ -384,32 +670,167 @@ def create_pdal_pipeline(input_url: str, output_laz: str,
     return pipeline
 
 
+def get_non_streamable_stages(pipeline: Dict[str, Any]) -> List[str]:
+    """
+    List the stages of a pipeline that prevent PDAL stream mode.
+    
+    Args:
+        pipeline: PDAL pipeline definition
+        
+    Returns:
+        list: Types of the stages that are not streamable (empty if the whole
+              pipeline can run in stream mode)
+    """
+    blockers = []
+    for stage in pipeline.get("pipeline", []):
+        stage_type = stage.get("type") if isinstance(stage, dict) else None
+        if stage_type not in STREAMABLE_STAGES and stage_type not in blockers:
+            blockers.append(stage_type)
+    return blockers
+
+
+def _execute_pipeline_python(pipeline: Dict[str, Any], stream: bool = False,
+                             chunk_size: int = 10000) -> Tuple[bool, int, Dict[str, Any]]:
+    """
+    Execute a PDAL pipeline in-process with the PDAL Python bindings.
+    
+    Args:
+        pipeline: PDAL pipeline definition
+        stream: Whether to execute in stream mode with bounded memory
+        chunk_size: Number of points per chunk in stream mode
+        
+    Returns:
+        tuple: (success, point_count, metadata)
+    """
+    try:
+        executor = pdal.Pipeline(json.dumps(pipeline))
+        if stream and hasattr(executor, "execute_streaming"):
+            point_count = executor.execute_streaming(chunk_size=chunk_size)
+        else:
+            if stream:
+                logger.warning("Installed PDAL bindings do not support stream mode, using standard mode")
+            point_count = executor.execute()
+        
+        # Older bindings return the metadata as a JSON string
+        metadata = executor.metadata
+        if isinstance(metadata, str):
+            metadata = json.loads(metadata)
+        
+        return True, int(point_count), metadata or {}
+    except Exception as e:
+        logger.error(f"PDAL pipeline failed: {str(e)}")
+        return False, 0, {}
+
+
+def _execute_pipeline_subprocess(pipeline: Dict[str, Any],
+                                 stream: bool = False) -> Tuple[bool, int, Dict[str, Any]]:
+    """
+    Execute a PDAL pipeline with the ``pdal pipeline`` command.
+    
+    The pipeline is passed on standard input, so no temporary file is written.
+    The pdal command uses its own chunk size in stream mode.
+    
+    Args:
+        pipeline: PDAL pipeline definition
+        stream: Whether to execute in stream mode with bounded memory
+        
+    Returns:
+        tuple: (success, point_count, metadata)
+    """
+    cmd = ["pdal", "pipeline", "--stdin"]
+    if stream:
+        cmd.append("--stream")
+    result = subprocess.run(cmd, input=json.dumps(pipeline), capture_output=True, text=True, check=False)
+    
+    if result.returncode != 0:
+        logger.error(f"PDAL pipeline failed: {result.stderr}")
+        return False, 0, {}
+    
+    # Read the point count and bounds from the output header instead of running pdal info
+    laz_file = pipeline["pipeline"][-1]["filename"]
+    header = read_las_header(laz_file)
+    if header is None:
+        return True, get_point_count(laz_file), {}
+    return True, header['point_count'], {'header': header}
+
+
+def execute_pdal_pipeline(pipeline: Dict[str, Any], engine: str = "auto",
+                          stream_mode: str = "auto",
+                          chunk_size: int = 10000) -> Tuple[bool, int, Dict[str, Any]]:
+    """
+    Execute a PDAL pipeline with the requested engine.
+    
+    In 'auto' stream mode the pipeline runs in PDAL stream mode, which keeps
+    only one chunk of points in memory, whenever all of its stages are
+    streamable. Stages that force standard mode are logged.
+    
+    Args:
+        pipeline: PDAL pipeline definition
+        engine: 'python' for the in-process PDAL bindings, 'subprocess' for the
+               pdal command, or 'auto' to use the bindings when they are installed
+        stream_mode: 'auto' to stream when possible, 'never' for standard mode
+        chunk_size: Number of points per chunk in stream mode (PDAL bindings only)
+        
+    Returns:
+        tuple: (success, point_count, metadata); for the subprocess engine the metadata
+               holds the output file's LAS header under 'header'
+    """
+    stream = False
+    if stream_mode != "never":
+        blockers = get_non_streamable_stages(pipeline)
+        if blockers:
+            logger.info(f"Running in standard mode, not streamable: {', '.join(map(str, blockers))}")
+        else:
+            stream = True
+            logger.info(f"Running in stream mode (chunk size {chunk_size})")
+    
+    if engine != "subprocess" and PDAL_PYTHON_AVAILABLE:
+        return _execute_pipeline_python(pipeline, stream, chunk_size)
+    
+    if engine == "python":
+        logger.warning("PDAL Python bindings not installed, falling back to the pdal command")
+    return _execute_pipeline_subprocess(pipeline, stream)
+
+
+def get_pipeline_copy_path(pipeline: Dict[str, Any], output_dir: str) -> str:
+    """
+    Get the path run_pdal_pipeline saves a copy of a pipeline to.
+    
+    Args:
+        pipeline: PDAL pipeline definition
+        output_dir: Directory the copy is saved in
+        
+    Returns:
+        str: Path of the ``<output name>_pipeline.json`` file
+    """
+    output_basename = os.path.basename(pipeline["pipeline"][-1]["filename"]).replace('.laz', '')
+    return os.path.join(output_dir, f"{output_basename}_pipeline.json")
+
+
 def run_pdal_pipeline(pipeline: Dict[str, Any], min_points: int = 100, 
-                     output_dir: Optional[str] = None) -> Tuple[bool, int]:
+                     output_dir: Optional[str] = None, engine: str = "auto",
+                     stream_mode: str = "auto", chunk_size: int = 10000) -> Tuple[bool, int]:
     """
-    Run a PDAL pipeline using subprocess.
+    Run a PDAL pipeline, in-process when the PDAL Python bindings are available.
+    
+    The run waits for a CPU slot of the shared scheduler, and for remote EPT
+    readers also for one HTTP slot per readers.ept fetch thread.
     
     Args:
         pipeline: PDAL pipeline definition
         min_points: Minimum number of points required for a successful result
         output_dir: Optional output directory to save a copy of the pipeline JSON
+        engine: PDAL execution engine ('auto', 'python' or 'subprocess')
+        stream_mode: 'auto' to use PDAL stream mode when all stages allow it, or 'never'
+        chunk_size: Number of points per chunk in stream mode
         
     Returns:
         tuple: (success, point_count)
     """
     try:
-        # Create a temporary pipeline JSON file with unique name
-        temp_id = str(time.time()).replace('.', '') + str(os.getpid())
-        pipeline_file = f"temp_pipeline_{temp_id}.json"
-        
-        with open(pipeline_file, "w") as f:
-            json.dump(pipeline, f, indent=4)
-        
         # If output_dir is provided, save a copy of the pipeline for reference
         if output_dir and os.path.isdir(output_dir):
-            output_laz = pipeline["pipeline"][-1]["filename"]
-            output_basename = os.path.basename(output_laz).replace('.laz', '')
-            pipeline_copy_path = os.path.join(output_dir, f"{output_basename}_pipeline.json")
+            pipeline_copy_path = get_pipeline_copy_path(pipeline, output_dir)
             
             try:
                 # Save a pretty-printed version of the pipeline
@@ -418,32 +839,29 @@ def run_pdal_pipeline(pipeline: Dict[str, Any], min_points: int = 100,
                 logger.info(f"Saved pipeline definition to {pipeline_copy_path}")
             except Exception as e:
                 logger.warning(f"Failed to save pipeline copy: {str(e)}")
-            
-        # Run PDAL pipeline using subprocess
-        cmd = ["pdal", "pipeline", pipeline_file]
         
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        # Readers fetching EPT over HTTP hold one HTTP slot per fetch thread
+        scheduler = get_scheduler()
+        http_slots = 0
+        reader = pipeline["pipeline"][0]
+        if reader.get("type") == "readers.ept" and str(reader.get("filename", "")).startswith(("http://", "https://")):
+            http_slots = scheduler.ept_reader_threads
+            pipeline = copy.deepcopy(pipeline)
+            pipeline["pipeline"][0]["threads"] = http_slots
         
-        # Clean up temporary file - only remove the temp file, not the saved copy
-        try:
-            os.remove(pipeline_file)
-        except:
-            pass
+        with scheduler.cpu.hold(), scheduler.http.hold(http_slots):
+            success, point_count, _ = execute_pdal_pipeline(pipeline, engine, stream_mode, chunk_size)
         
         laz_file = pipeline["pipeline"][-1]["filename"]
         
-        if result.returncode == 0:
+        if success:
             # If PDAL pipeline ran successfully, consider it a success
-            # Get the point count just for logging purposes
-            point_count = get_point_count(laz_file)
-            
             if point_count == 0:
                 logger.warning(f"Pipeline successful but output file contains 0 points: {laz_file}")
             
             # Always return success if the pipeline executed without errors
             return True, point_count
         else:
-            logger.error(f"PDAL pipeline failed: {result.stderr}")
             return False, 0
             
     except Exception as e:
@@ -451,9 +869,57 @@ def run_pdal_pipeline(pipeline: Dict[str, Any], min_points: int = 100,
         return False, 0
 
 
+def read_las_header(laz_file: str) -> Optional[Dict[str, Any]]:
+    """
+    Read point count and bounds from the public header of a LAS/LAZ file.
+    
+    Only the fixed-size public header block is read, so this costs a single
+    small read regardless of the file size. LAZ files share the LAS header.
+    
+    Args:
+        laz_file: Path to the LAS/LAZ file
+        
+    Returns:
+        dict: Header values (version, point_format, point_count, bounds, minz,
+              maxz, file_size) or None if the file is missing or not LAS
+    """
+    try:
+        with open(laz_file, "rb") as f:
+            data = f.read(LAS_HEADER_READ_SIZE)
+        
+        if len(data) < 227 or data[:4] != b"LASF":
+            return None
+        
+        major, minor = data[24], data[25]
+        
+        # Legacy 32-bit count, superseded by the 64-bit count in LAS 1.4
+        point_count = struct.unpack_from("<I", data, 107)[0]
+        if (major, minor) >= (1, 4) and len(data) >= 255:
+            point_count = struct.unpack_from("<Q", data, 247)[0] or point_count
+        
+        max_x, min_x, max_y, min_y, max_z, min_z = struct.unpack_from("<6d", data, 179)
+        
+        return {
+            'version': f"{major}.{minor}",
+            # The two high bits flag LAZ compression
+            'point_format': data[104] & 0x3F,
+            'point_count': point_count,
+            'bounds': [min_x, min_y, max_x, max_y],
+            'minz': min_z,
+            'maxz': max_z,
+            'file_size': os.path.getsize(laz_file)
+        }
+    except Exception as e:
+        logger.warning(f"Error reading LAS header from {laz_file}: {str(e)}")
+        return None
+
+
 def get_point_count(laz_file: str) -> int:
     """
-    Get the point count from a LAZ file using PDAL info.
+    Get the point count from a LAZ file.
+    
+    The count is read from the file header; PDAL info is only used for files
+    whose header cannot be parsed.
     
     Args:
         laz_file: Path to the LAZ file
@@ -464,6 +930,10 @@ def get_point_count(laz_file: str) -> int:
     try:
         if not os.path.exists(laz_file):
             return 0
+        
+        header = read_las_header(laz_file)
+        if header is not None:
+            return header['point_count']
             
         cmd = ["pdal", "info", "--summary", laz_file]
         result = subprocess.run(cmd, capture_output=True, text=True, check=False)
@@ -482,7 +952,10 @@ def get_point_count(laz_file: str) -> int:
 
 def get_bounds(laz_file: str) -> Optional[List[float]]:
     """
-    Get the bounds of a LAZ file using PDAL info.
+    Get the bounds of a LAZ file.
+    
+    The bounds are read from the file header; PDAL info is only used for files
+    whose header cannot be parsed.
     
     Args:
         laz_file: Path to the LAZ file
@@ -493,6 +966,10 @@ def get_bounds(laz_file: str) -> Optional[List[float]]:
     try:
         if not os.path.exists(laz_file):
             return None
+        
+        header = read_las_header(laz_file)
+        if header is not None:
+            return header['bounds']
             
         cmd = ["pdal", "info", "--summary", laz_file]
         result = subprocess.run(cmd, capture_output=True, text=True, check=False)
@@ -549,39 +1026,763 @@ def create_processing_tiles(bounds: List[float], tile_size: float = 1000) -> Lis
     return tiles
 
 
-def download_dataset(boundary_geojson: Dict[str, Any], dataset: Dict[str, Any], 
-                    output_dir: str, config: Dict[str, Any], geojson_filename: str = None) -> List[str]:
+def get_ept_url(s3_url: str, config: Dict[str, Any]) -> str:
     """
-    Download LAZ files from a USGS LiDAR dataset that intersect with the boundary.
+    Build the ept.json URL of a dataset.
+    
+    An ``ept_mirror`` holds the datasets without the bucket name, as
+    ``<ept_mirror>/<dataset>/ept.json``.
     
     Args:
-        boundary_geojson: GeoJSON boundary as a dictionary
-        dataset: Dataset information dictionary with name, url, s3_url
-        output_dir: Directory to save the LAZ files
+        s3_url: Dataset S3 location (bucket/prefix)
         config: Configuration dictionary
-        geojson_filename: Optional name to use for the output file (without extension)
         
     Returns:
-        list: List of paths to downloaded LAZ files
+        str: URL of the dataset's ept.json
     """
-    try:
-        # Extract dataset information
-        dataset_name = dataset.get('name', 'unknown')
-        s3_url = dataset.get('s3_url')
-        
-        if not s3_url:
-            logger.error(f"No S3 URL available for dataset: {dataset_name}")
-            return []
-        
-        # Determine AWS region (default to us-west-2)
-        region = config.get('region', 'us-west-2')
+    # A local mirror or caching proxy replaces the S3 endpoint and bucket
+    if config.get('ept_mirror'):
+        dataset_path = s3_url.strip('/').split('/', 1)[-1]
+        return f"{config['ept_mirror'].rstrip('/')}/{dataset_path}/ept.json"
+    
+    # Determine AWS region (default to us-west-2)
+    region = config.get('region', 'us-west-2')
+    return f"https://s3-{region}.amazonaws.com/{s3_url}/ept.json"
+
+
+@contextmanager
+def resolve_ept_source(ept_url: str, boundary_geojson: Dict[str, Any], config: Dict[str, Any]) -> Iterator[str]:
+    """
+    Provide the ept.json that readers.ept should read for a download.
+    
+    With ``ept_node_cache`` enabled, the nodes the download needs are
+    mirrored into the local node cache and the mirrored ept.json is used;
+    the mirrored nodes stay pinned in the cache until the context exits, so
+    run every pipeline reading them inside it. Otherwise, or if mirroring
+    fails, the remote URL is used.
+    
+    Args:
+        ept_url: URL of the dataset's ept.json
+        boundary_geojson: GeoJSON boundary as a dictionary
+        config: Configuration dictionary
         
-        # Construct EPT URL
-        ept_url = f"https://s3-{region}.amazonaws.com/{s3_url}/ept.json"
+    Yields:
+        str: Local ept.json path or ``ept_url``
+    """
+    if not config.get('ept_node_cache'):
+        yield ept_url
+        return
+    
+    mirror = mirror_ept_dataset(ept_url, boundary_geojson, config.get('resolution'), config)
+    if mirror is None:
+        logger.warning(f"EPT node cache unavailable, reading {ept_url} directly")
+        yield ept_url
+        return
+    
+    local_ept, pinned = mirror
+    logger.info(f"Reading EPT nodes from local cache: {local_ept}")
+    try:
+        yield local_ept
+    finally:
+        release_ept_mirror(pinned, config)
+
+
+def with_ept_source(pipeline: Dict[str, Any], ept_source: str) -> Dict[str, Any]:
+    """
+    Return a copy of a pipeline whose readers.ept stage reads ``ept_source``.
+    
+    Manifest hashes are computed on the original pipeline, so switching
+    between S3 and the local node cache does not invalidate finished work.
+    
+    Args:
+        pipeline: PDAL pipeline definition
+        ept_source: ept.json URL or local path
+        
+    Returns:
+        dict: Pipeline definition reading from ``ept_source``
+    """
+    pipeline = copy.deepcopy(pipeline)
+    pipeline["pipeline"][0]["filename"] = ept_source
+    return pipeline
+
+
+def get_dataset_year(dataset: Dict[str, Any]) -> Optional[int]:
+    """
+    Get the acquisition year of a dataset as an integer.
+    
+    Args:
+        dataset: Dataset information dictionary
+        
+    Returns:
+        int: Year or None if the dataset has no valid year
+    """
+    try:
+        year = float(dataset.get('year'))
+    except (TypeError, ValueError):
+        return None
+    if year != year:  # NaN
+        return None
+    return int(year)
+
+
+def get_pipeline_options(config: Dict[str, Any],
+                         dataset: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Collect the create_pdal_pipeline() processing options from the configuration.
+    
+    Args:
+        config: Configuration dictionary
+        dataset: Optional dataset information dictionary (used for Year tagging)
+        
+    Returns:
+        dict: Keyword arguments for create_pdal_pipeline()
+    """
+    # Get coordinate reference system from config if specified
+    coordinate_reference_system = config.get('coordinate_reference_system')
+    if coordinate_reference_system:
+        logger.info(f"Using coordinate reference system: {coordinate_reference_system}")
+        
+    # Get outlier filter parameters from config if specified
+    outlier_filter = config.get('outlier_filter', False)
+    outlier_mean_k = config.get('outlier_mean_k', 12)
+    outlier_multiplier = config.get('outlier_multiplier', 2.2)
+    
+    if outlier_filter:
+        logger.info(f"Using statistical outlier filter with mean_k={outlier_mean_k}, multiplier={outlier_multiplier}")
+    
+    return {
+        'resolution': config.get('resolution'),
+        'classify_ground': config.get('classify_ground', False),
+        'coordinate_reference_system': coordinate_reference_system,
+        'outlier_filter': outlier_filter,
+        'outlier_mean_k': outlier_mean_k,
+        'outlier_multiplier': outlier_multiplier,
+        'year': (get_dataset_year(dataset)
+                 if dataset and config.get('add_year') and config.get('year_tagging', 'pipeline') == 'pipeline'
+                 else None)
+    }
+
+
+def get_tile_buffer(config: Dict[str, Any]) -> float:
+    """
+    Get the buffer in meters read around each tile.
+    
+    Ground classification and the outlier filter look at neighboring points,
+    so tiles read a buffer around their core and crop it away afterwards. By
+    default the buffer is the SMRF window for ground classification and
+    ``outlier_mean_k`` point spacings (the resolution, or 1 meter at full
+    resolution) for the outlier filter; a non-negative ``tile_buffer``
+    overrides it. A negative buffer would shrink the tiles and leave gaps
+    between them, so it is ignored like in validate_config.
+    
+    Args:
+        config: Configuration dictionary
+        
+    Returns:
+        float: Buffer in meters, 0 when no neighborhood filter is used
+    """
+    if config.get('tile_buffer') is not None and float(config['tile_buffer']) >= 0:
+        return float(config['tile_buffer'])
+    
+    buffer = 0.0
+    if config.get('classify_ground'):
+        buffer = max(buffer, SMRF_WINDOW)
+    if config.get('outlier_filter'):
+        try:
+            spacing = float(config.get('resolution'))
+        except (ValueError, TypeError):
+            spacing = 1.0
+        buffer = max(buffer, config.get('outlier_mean_k', 12) * spacing)
+    return buffer
+
+
+def plan_dataset_tiles(boundary_geojson: Dict[str, Any], dataset: Dict[str, Any],
+                       tile_size: float) -> Tuple[Optional[Dict[str, Any]], List[List[float]], Optional[str]]:
+    """
+    Split the part of the boundary covered by a dataset into square tiles.
+    
+    Tiles are laid out in the UTM zone of the area so that ``tile_size`` is
+    in meters.
+    
+    Args:
+        boundary_geojson: GeoJSON boundary as a dictionary
+        dataset: Dataset information dictionary with its footprint geometry
+        tile_size: Tile edge length in meters
+        
+    Returns:
+        tuple: (area as a GeoJSON geometry in EPSG:4326, tile bounds, tile SRS),
+               or (None, [], None) if the boundary does not overlap the dataset
+    """
+    area = boundary_geometry(boundary_geojson)
+    if area is None:
+        return None, [], None
+    
+    # Clip the boundary to the dataset footprint
+    if dataset.get('geometry'):
+        area = area.intersection(shape(dataset['geometry']))
+        if area.geom_type == 'GeometryCollection':
+            # Keep only the polygonal parts of the overlap
+            area = unary_union([part for part in area.geoms if part.geom_type in ('Polygon', 'MultiPolygon')])
+    if area.is_empty:
+        return None, [], None
+    
+    area_series = gpd.GeoSeries([area], crs="EPSG:4326")
+    utm_crs = area_series.estimate_utm_crs()
+    tile_srs = f"EPSG:{utm_crs.to_epsg()}"
+    
+    tiles = create_processing_tiles(list(area_series.to_crs(utm_crs).total_bounds), tile_size)
+    return mapping(area), tiles, tile_srs
+
+
+def split_tiles_by_density(tiles: List[List[float]], tile_srs: str, density: gpd.GeoDataFrame,
+                           max_points: int, min_size: float) -> List[List[float]]:
+    """
+    Recursively split tiles into quarters until each holds at most ``max_points``.
+    
+    Points per tile are estimated from the EPT node counts in ``density``,
+    weighting each node by the fraction of it that the tile covers. Each
+    axis is halved only while the halves are at least ``min_size`` meters,
+    so tall or wide tiles (clipped to the dataset) are split into halves
+    along their longer axis once the shorter one reaches the minimum.
+    
+    Args:
+        tiles: Tile bounds in ``tile_srs``
+        tile_srs: SRS of the tile bounds
+        density: EPT node boxes and counts (see load_point_density)
+        max_points: Target maximum points per tile
+        min_size: Minimum tile edge length
+        
+    Returns:
+        list: Tile bounds, with dense tiles replaced by their sub-tiles in place
+    """
+    nodes = density.to_crs(tile_srs)
+    node_areas = nodes.geometry.area.to_numpy()
+    counts = nodes['count'].to_numpy()
+    
+    def estimate(tile_bounds: List[float]) -> float:
+        tile = box(*tile_bounds)
+        index = nodes.sindex.query(tile, predicate="intersects")
+        if len(index) == 0:
+            return 0.0
+        overlap = nodes.geometry.iloc[index].intersection(tile).area.to_numpy()
+        return float((counts[index] * overlap / node_areas[index]).sum())
+    
+    def split(tile_bounds: List[float]) -> List[List[float]]:
+        minx, miny, maxx, maxy = tile_bounds
+        split_x = (maxx - minx) / 2 >= min_size
+        split_y = (maxy - miny) / 2 >= min_size
+        if not (split_x or split_y) or estimate(tile_bounds) <= max_points:
+            return [tile_bounds]
+        xs = [minx, (minx + maxx) / 2, maxx] if split_x else [minx, maxx]
+        ys = [miny, (miny + maxy) / 2, maxy] if split_y else [miny, maxy]
+        parts = [
+            [xs[i], ys[j], xs[i + 1], ys[j + 1]]
+            for j in range(len(ys) - 1) for i in range(len(xs) - 1)
+        ]
+        return [sub_tile for part in parts for sub_tile in split(part)]
+    
+    return [sub_tile for tile_bounds in tiles for sub_tile in split(tile_bounds)]
+
+
+def expand_bounds(bounds: List[float], buffer: float) -> List[float]:
+    """Grow [minx, miny, maxx, maxy] bounds by ``buffer`` on every side."""
+    return [bounds[0] - buffer, bounds[1] - buffer, bounds[2] + buffer, bounds[3] + buffer]
+
+
+def clip_tiles_to_area(tiles: List[List[float]], tile_srs: str, area_geojson: Dict[str, Any],
+                       buffer: float = 0) -> Tuple[List[List[float]], List[Dict[str, Any]]]:
+    """
+    Clip tiles to the area they are meant to cover and drop empty ones.
+    
+    Tiles laid out over the bounding box of a long, thin or L-shaped area
+    mostly miss it; only tiles whose intersection with the area has a
+    non-zero surface are kept.
+    
+    The kept tiles do not partition the points exactly: neighboring tiles
+    share their edges and bounds are inclusive, so points on a shared edge
+    are read by both tiles (and by more when ``buffer`` grows the polygons).
+    Merging with ``merge_dedup`` writes those points once.
+    
+    Args:
+        tiles: Tile bounds in ``tile_srs``
+        tile_srs: SRS of the tile bounds
+        area_geojson: Area as a GeoJSON geometry in EPSG:4326 (boundary
+                      already clipped to the dataset footprint)
+        buffer: Distance the returned polygons extend beyond each tile
+        
+    Returns:
+        tuple: (bounds of the kept tiles, clipped polygon of each kept tile,
+               grown by ``buffer``, as a GeoJSON geometry in EPSG:4326)
+    """
+    if not tiles:
+        return [], []
+    
+    area = gpd.GeoSeries([shape(area_geojson)], crs="EPSG:4326").to_crs(tile_srs).iloc[0]
+    clipped = gpd.GeoSeries([box(*tile_bounds) for tile_bounds in tiles], crs=tile_srs).intersection(area)
+    
+    def polygonal(geometry):
+        # Keep only the polygonal parts, edges touching the area are dropped
+        if geometry.geom_type == 'GeometryCollection':
+            return unary_union([geom for geom in geometry.geoms if geom.geom_type in ('Polygon', 'MultiPolygon')])
+        return geometry
+    
+    kept_tiles = []
+    kept_parts = []
+    for tile_bounds, part in zip(tiles, clipped):
+        part = polygonal(part)
+        if part.is_empty or part.area <= 0:
+            continue
+        if buffer:
+            part = polygonal(area.intersection(box(*expand_bounds(tile_bounds, buffer))))
+        kept_tiles.append(tile_bounds)
+        kept_parts.append(part)
+    
+    polygons = gpd.GeoSeries(kept_parts, crs=tile_srs).to_crs("EPSG:4326")
+    return kept_tiles, [mapping(polygon) for polygon in polygons]
+
+
+def _point_keys(points, header) -> np.ndarray:
+    """Return one comparable key per point from its integer coordinates and GPS time."""
+    columns = [
+        np.round((points.x - header.offsets[0]) / header.scales[0]).astype(np.int64),
+        np.round((points.y - header.offsets[1]) / header.scales[1]).astype(np.int64),
+        np.round((points.z - header.offsets[2]) / header.scales[2]).astype(np.int64)
+    ]
+    if 'gps_time' in points.point_format.dimension_names:
+        columns.append(np.asarray(points.gps_time, dtype=np.float64).view(np.int64))
+    keys = np.ascontiguousarray(np.column_stack(columns))
+    return keys.view(np.dtype((np.void, keys.dtype.itemsize * keys.shape[1]))).ravel()
+
+
+def merge_laz_tiles(tile_files: List[str], output_file: str, dedup: bool = True,
+                    chunk_size: int = DEFAULT_YEAR_CHUNK_SIZE) -> bool:
+    """
+    Concatenate tile LAZ files into one LAZ file with laspy.
+    
+    Tiles are streamed chunk by chunk, and with the lazrs backend chunks are
+    decompressed and compressed on all cores. The header, VLRs and extra
+    dimensions of the first tile are kept. With ``dedup``, points that two
+    neighboring tiles both wrote (same coordinates and GPS time, only looked
+    for where the tiles' extents overlap) are written once.
+    
+    Args:
+        tile_files: Paths of the tile LAZ files
+        output_file: Path of the merged LAZ file
+        dedup: Whether to drop points duplicated across tile edges
+        chunk_size: Number of points read and written at a time
+        
+    Returns:
+        bool: True if successful, False if laspy is unavailable or the tiles
+              do not share a point format
+    """
+    if not LASPY_AVAILABLE:
+        return False
+    
+    try:
+        backend = laspy.LazBackend.LazrsParallel if laspy.LazBackend.LazrsParallel.is_available() else None
+        
+        headers = []
+        for tile_file in tile_files:
+            with laspy.open(tile_file) as reader:
+                headers.append(reader.header)
+        first = headers[0]
+        dimensions = list(first.point_format.dimension_names)
+        if any(list(header.point_format.dimension_names) != dimensions for header in headers):
+            logger.warning("Tiles have different point formats, cannot merge with laspy")
+            return False
+        out_header = copy.deepcopy(first)
+        
+        # Duplicates can only occur where the extents of two tiles overlap
+        extents = [(h.mins[0], h.mins[1], h.maxs[0], h.maxs[1]) for h in headers]
+        overlaps = {}
+        if dedup:
+            for i, a in enumerate(extents):
+                for j in range(i + 1, len(extents)):
+                    b = extents[j]
+                    if a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]:
+                        overlaps[(i, j)] = (max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3]))
+        edge_keys = {pair: [] for pair in overlaps}
+        
+        def inside(points, extent) -> np.ndarray:
+            return ((points.x >= extent[0]) & (points.x <= extent[2]) &
+                    (points.y >= extent[1]) & (points.y <= extent[3]))
+        
+        duplicates = 0
+        with laspy.open(output_file, mode="w", header=out_header, laz_backend=backend) as writer:
+            for index, tile_file in enumerate(tile_files):
+                later = [(pair, extent) for pair, extent in overlaps.items() if pair[0] == index]
+                earlier = [(pair, extent) for pair, extent in overlaps.items() if pair[1] == index]
+                earlier_keys = {pair: np.concatenate(edge_keys.pop(pair)) if edge_keys[pair] else None
+                                for pair, _ in earlier}
+                
+                with laspy.open(tile_file, laz_backend=backend) as reader:
+                    for chunk in reader.chunk_iterator(chunk_size):
+                        keep = np.ones(len(chunk), dtype=bool)
+                        keys = None
+                        for pair, extent in earlier:
+                            mask = inside(chunk, extent)
+                            if earlier_keys[pair] is None or not mask.any():
+                                continue
+                            keys = _point_keys(chunk, out_header) if keys is None else keys
+                            keep &= ~(mask & np.isin(keys, earlier_keys[pair]))
+                        for pair, extent in later:
+                            mask = inside(chunk, extent)
+                            if mask.any():
+                                keys = _point_keys(chunk, out_header) if keys is None else keys
+                                edge_keys[pair].append(keys[mask & keep])
+                        
+                        duplicates += int(len(keep) - keep.sum())
+                        points = laspy.ScaleAwarePointRecord.zeros(int(keep.sum()), header=out_header)
+                        for dim_name in dimensions:
+                            if dim_name not in ('X', 'Y', 'Z'):
+                                points[dim_name] = chunk[dim_name][keep]
+                        # Assign scaled coordinates, tiles may use other scales or offsets
+                        points.x = chunk.x[keep]
+                        points.y = chunk.y[keep]
+                        points.z = chunk.z[keep]
+                        writer.write_points(points)
+        
+        if duplicates:
+            logger.info(f"Dropped {duplicates} points duplicated across tile edges")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Error merging tiles with laspy: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return False
+
+
+def write_copc(input_file: str, output_file: str, config: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Convert a LAS/LAZ file to COPC with PDAL.
+    
+    Args:
+        input_file: Path of the LAS/LAZ file
+        output_file: Path of the COPC file
+        config: Optional configuration dictionary
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    config = config or {}
+    pipeline = {"pipeline": [input_file, {"type": "writers.copc", "filename": output_file, "extra_dims": "all"}]}
+    try:
+        with get_scheduler().cpu.hold():
+            success, _, _ = execute_pdal_pipeline(pipeline, config.get('pdal_engine', 'auto'), "never")
+        return success
+    except Exception as e:
+        logger.error(f"Error writing COPC file {output_file}: {str(e)}")
+        return False
+
+
+def merge_tile_outputs(tile_files: List[str], output_file: str,
+                       config: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Merge tile LAZ files into a single LAZ or COPC file.
+    
+    A single tile is moved into place as is. Otherwise the tiles are merged
+    with laspy (see merge_laz_tiles), which drops the points neighboring
+    tiles both contain when ``merge_dedup`` is enabled. ``pdal merge`` cannot
+    drop them, so it is only used when ``merge_dedup`` is disabled: when
+    ``merge_engine`` is 'pdal', or as the fallback of 'auto' when laspy
+    cannot merge the tiles. With ``merge_format`` 'copc' the merged LAZ file
+    is then converted to COPC by PDAL.
+    
+    Args:
+        tile_files: Paths of the tile LAZ files
+        output_file: Path of the merged LAZ or COPC file
+        config: Optional configuration dictionary
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    config = config or {}
+    if config.get('merge_format', 'laz') == 'copc':
+        if len(tile_files) == 1:
+            return write_copc(tile_files[0], output_file, config)
+        merged_file = f"{output_file}.merged.laz"
+        try:
+            return (merge_tile_outputs(tile_files, merged_file, dict(config, merge_format='laz'))
+                    and write_copc(merged_file, output_file, config))
+        finally:
+            if os.path.exists(merged_file):
+                os.remove(merged_file)
+    
+    try:
+        if len(tile_files) == 1:
+            os.replace(tile_files[0], output_file)
+            return True
+        
+        engine = config.get('merge_engine', 'auto')
+        dedup = config.get('merge_dedup', True)
+        if engine == 'pdal' and dedup:
+            logger.error("pdal merge cannot drop points duplicated across tile edges; "
+                         "use merge_engine 'laspy' or disable merge_dedup")
+            return False
+        if engine != 'pdal':
+            with get_scheduler().cpu.hold():
+                merged = merge_laz_tiles(tile_files, output_file, dedup,
+                                         config.get('year_chunk_size', DEFAULT_YEAR_CHUNK_SIZE))
+            if merged:
+                return True
+            if engine == 'laspy' or dedup:
+                logger.error("Merging tiles with laspy failed")
+                return False
+            logger.info("Falling back to pdal merge")
+        
+        cmd = ["pdal", "merge"] + tile_files + [output_file]
+        with get_scheduler().cpu.hold():
+            result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        if result.returncode != 0:
+            logger.error(f"PDAL merge failed: {result.stderr}")
+            return False
+        return True
+    
+    except Exception as e:
+        logger.error(f"Error merging tiles: {str(e)}")
+        return False
+
+
+def download_dataset_tiled(boundary_geojson: Dict[str, Any], dataset: Dict[str, Any],
+                           output_dir: str, config: Dict[str, Any], geojson_filename: str = None,
+                           manifest: Optional[JobManifest] = None) -> List[str]:
+    """
+    Download a dataset as independent tiles processed in parallel.
+    
+    The boundary, clipped to the dataset footprint, is split into tiles of
+    ``tile_size`` meters. Each tile runs its own PDAL pipeline in a worker
+    pool of ``tile_workers`` threads; a failed tile is retried on its own up
+    to ``tile_retries`` times. With ``merge_tiles`` enabled the tiles are
+    merged into a single LAZ file afterwards, named ``<name>.copc.laz``
+    when ``merge_format`` is 'copc'.
+    
+    Args:
+        boundary_geojson: GeoJSON boundary as a dictionary
+        dataset: Dataset information dictionary with name, s3_url and geometry
+        output_dir: Directory to save the LAZ files
+        config: Configuration dictionary
+        geojson_filename: Optional name to use for the output file (without extension)
+        manifest: Optional job manifest used to record and resume the dataset and each tile
+        
+    Returns:
+        list: The merged LAZ file, or the tile LAZ files when merging is disabled
+    """
+    try:
+        dataset_name = dataset.get('name', 'unknown')
+        s3_url = dataset.get('s3_url')
+        
+        if not s3_url:
+            logger.error(f"No S3 URL available for dataset: {dataset_name}")
+            return []
+        
+        ept_url = get_ept_url(s3_url, config)
         logger.info(f"Using EPT URL: {ept_url}")
         
-        # Determine resolution
-        resolution = config.get('resolution')
+        output_filename = geojson_filename if geojson_filename else dataset_name
+        merge = config.get('merge_tiles', True)
+        copc = merge and config.get('merge_format', 'laz') == 'copc'
+        if copc and get_year_tagging(dataset, config):
+            # Both post-processing modes would have to rewrite the COPC file
+            logger.error(f"Year tagging mode '{config.get('year_tagging')}' cannot tag COPC output, "
+                         f"use the 'pipeline' mode with merge_format 'copc'")
+            return []
+        output_file = os.path.join(output_dir, f"{output_filename}.copc.laz" if copc else f"{output_filename}.laz")
+        tiles_dir = os.path.join(output_dir, f"{output_filename}_tiles")
+        os.makedirs(tiles_dir, exist_ok=True)
+        
+        area, tiles, tile_srs = plan_dataset_tiles(
+            boundary_geojson, dataset, config.get('tile_size', 1000)
+        )
+        if not tiles:
+            logger.warning(f"Boundary does not overlap dataset {dataset_name}")
+            return []
+        
+        # Split dense tiles so every tile holds a similar number of points
+        max_tile_points = config.get('tile_max_points')
+        if max_tile_points and max_tile_points > 0:
+            density = load_point_density(ept_url, area, config.get('resolution'))
+            if density is not None and not density.empty:
+                tile_count = len(tiles)
+                tiles = split_tiles_by_density(
+                    tiles, tile_srs, density, max_tile_points, config.get('tile_min_size', 100)
+                )
+                logger.info(f"Dataset {dataset_name}: split {tile_count} tiles into {len(tiles)} "
+                            f"for at most ~{max_tile_points:,} points each")
+            else:
+                logger.warning(f"Dataset {dataset_name}: no EPT point density available, using uniform tiles")
+        
+        # Clip tiles to the area so no tile reads nodes outside of it
+        tile_count = len(tiles)
+        tile_buffer = get_tile_buffer(config)
+        tiles, tile_polygons = clip_tiles_to_area(tiles, tile_srs, area, tile_buffer)
+        if tile_count != len(tiles):
+            logger.info(f"Dataset {dataset_name}: skipping {tile_count - len(tiles)} tiles outside the boundary")
+        if not tiles:
+            logger.warning(f"Boundary does not overlap dataset {dataset_name}")
+            return []
+        logger.info(f"Dataset {dataset_name}: processing {len(tiles)} tiles in {tile_srs}")
+        if tile_buffer:
+            logger.info(f"Dataset {dataset_name}: reading a {tile_buffer:g} m buffer around each tile")
+        
+        min_points = config.get('min_points', 100)
+        retries = config.get('tile_retries', 1)
+        pipeline_options = get_pipeline_options(config, dataset)
+        engine = config.get('pdal_engine', 'auto')
+        
+        tile_pipelines = [
+            create_pdal_pipeline(
+                input_url=ept_url,
+                output_laz=os.path.join(tiles_dir, f"{output_filename}_tile_{index}.laz"),
+                boundary_geojson=tile_polygon,
+                bounds=expand_bounds(tile_bounds, tile_buffer),
+                bounds_srs=tile_srs,
+                crop_bounds=tile_bounds if tile_buffer else None,
+                **pipeline_options
+            )
+            for index, (tile_bounds, tile_polygon) in enumerate(zip(tiles, tile_polygons))
+        ]
+        
+        # Skip the dataset if a previous run already completed it
+        dataset_hash = job_hash({'tiles': tile_pipelines, 'merge': merge,
+                                 'merge_format': config.get('merge_format', 'laz')}, dataset, config)
+        if manifest:
+            completed = manifest.completed_outputs(output_filename, dataset_hash)
+            if completed is not None:
+                return completed
+        
+        def process_tile(index: int) -> Optional[str]:
+            pipeline = tile_pipelines[index]
+            tile_file = pipeline["pipeline"][-1]["filename"]
+            unit_id = f"{output_filename}/tile_{index}"
+            unit_hash = job_hash(pipeline, dataset, config)
+            
+            # Reuse tiles finished by a previous run
+            if manifest:
+                completed = manifest.completed_outputs(unit_id, unit_hash)
+                if completed is not None:
+                    return completed[0] if completed else None
+            
+            for attempt in range(retries + 1):
+                if attempt:
+                    logger.info(f"Retrying tile {index} of {dataset_name} (attempt {attempt + 1})")
+                success, point_count = run_pdal_pipeline(
+                    with_ept_source(pipeline, ept_source), min_points, tiles_dir, engine,
+                    config.get('stream_mode', 'auto'), config.get('stream_chunk_size', 10000)
+                )
+                if success:
+                    # Tiles without any points may not produce an output file
+                    if manifest:
+                        manifest.record(unit_id, STATUS_COMPLETE, unit_hash, tile_file, point_count)
+                    return tile_file if os.path.exists(tile_file) else None
+            
+            logger.error(f"Tile {index} of {dataset_name} failed after {retries + 1} attempts")
+            if manifest:
+                manifest.record(unit_id, STATUS_FAILED, unit_hash)
+            raise RuntimeError(f"tile {index} failed")
+        
+        max_workers = max(1, min(config.get('tile_workers') or os.cpu_count() or 1, len(tiles)))
+        tile_files = [None] * len(tiles)
+        failed_tiles = []
+        with resolve_ept_source(ept_url, area, config) as ept_source:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(process_tile, index): index
+                    for index in range(len(tiles))
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    index = futures[future]
+                    try:
+                        tile_files[index] = future.result()
+                    except Exception:
+                        failed_tiles.append(index)
+        
+        tile_files = [tile_file for tile_file in tile_files if tile_file]
+        if failed_tiles:
+            logger.error(f"Dataset {dataset_name}: {len(failed_tiles)} of {len(tiles)} tiles failed: {sorted(failed_tiles)}")
+            if manifest:
+                manifest.record(output_filename, STATUS_FAILED, dataset_hash)
+            return []
+        if not tile_files:
+            logger.warning(f"Dataset {dataset_name}: no tile produced any points")
+            return []
+        
+        if not merge:
+            logger.info(f"Dataset {dataset_name}: {len(tile_files)} tiles written to {tiles_dir}")
+            if not apply_year_tagging(tile_files, dataset, config):
+                if manifest:
+                    manifest.record(output_filename, STATUS_FAILED, dataset_hash)
+                return []
+            if manifest:
+                manifest.record(output_filename, STATUS_COMPLETE, dataset_hash, tile_files)
+            return tile_files
+        
+        if not merge_tile_outputs(tile_files, output_file, config):
+            if manifest:
+                manifest.record(output_filename, STATUS_FAILED, dataset_hash)
+            return []
+        
+        if not apply_year_tagging([output_file], dataset, config):
+            if manifest:
+                manifest.record(output_filename, STATUS_FAILED, dataset_hash)
+            return []
+        
+        # Keep the tiles until the merged file is complete so a failed job can be retried
+        for tile_file in tile_files:
+            if os.path.exists(tile_file):
+                os.remove(tile_file)
+        # Remove the pipeline copies run_pdal_pipeline saved for every tile, and the directory
+        for pipeline in tile_pipelines:
+            pipeline_copy = get_pipeline_copy_path(pipeline, tiles_dir)
+            if os.path.exists(pipeline_copy):
+                os.remove(pipeline_copy)
+        try:
+            os.rmdir(tiles_dir)
+        except OSError:
+            logger.warning(f"Could not remove tile directory {tiles_dir}, it is not empty")
+        
+        file_size = os.path.getsize(output_file) / (1024 * 1024)  # Convert to MB
+        logger.info(f"Dataset {dataset_name}: merged {len(tile_files)} tiles, {file_size:.2f} MB")
+        if manifest:
+            manifest.record(output_filename, STATUS_COMPLETE, dataset_hash, output_file)
+        return [output_file]
+    
+    except Exception as e:
+        logger.error(f"Error downloading dataset in tiles: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return []
+
+
+def download_dataset(boundary_geojson: Dict[str, Any], dataset: Dict[str, Any], 
+                    output_dir: str, config: Dict[str, Any], geojson_filename: str = None,
+                    manifest: Optional[JobManifest] = None) -> List[str]:
+    """
+    Download LAZ files from a USGS LiDAR dataset that intersect with the boundary.
+    
+    Args:
+        boundary_geojson: GeoJSON boundary as a dictionary
+        dataset: Dataset information dictionary with name, url, s3_url
+        output_dir: Directory to save the LAZ files
+        config: Configuration dictionary
+        geojson_filename: Optional name to use for the output file (without extension)
+        manifest: Optional job manifest used to record and resume work
+        
+    Returns:
+        list: List of paths to downloaded LAZ files
+    """
+    try:
+        # Extract dataset information
+        dataset_name = dataset.get('name', 'unknown')
+        s3_url = dataset.get('s3_url')
+        
+        if not s3_url:
+            logger.error(f"No S3 URL available for dataset: {dataset_name}")
+            return []
+        
+        # Construct EPT URL
+        ept_url = get_ept_url(s3_url, config)
+        logger.info(f"Using EPT URL: {ept_url}")
         
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
@@ -595,50 +1796,51 @@ def download_dataset(boundary_geojson: Dict[str, Any], dataset: Dict[str, Any],
         # Create a single output file for the dataset
         output_file = os.path.join(output_dir, f"{output_filename}.laz")
         
-        # Check if ground classification is enabled
-        classify_ground = config.get('classify_ground', False)
-        
-        # Get coordinate reference system from config if specified
-        coordinate_reference_system = config.get('coordinate_reference_system')
-        if coordinate_reference_system:
-            logger.info(f"Using coordinate reference system: {coordinate_reference_system}")
-            
-        # Get outlier filter parameters from config if specified
-        outlier_filter = config.get('outlier_filter', False)
-        outlier_mean_k = config.get('outlier_mean_k', 12)
-        outlier_multiplier = config.get('outlier_multiplier', 2.2)
-        
-        if outlier_filter:
-            logger.info(f"Using statistical outlier filter with mean_k={outlier_mean_k}, multiplier={outlier_multiplier}")
-            
         # Create pipeline using the boundary directly
         pipeline = create_pdal_pipeline(
             input_url=ept_url,
             output_laz=output_file,
             boundary_geojson=boundary_geojson,
-            resolution=resolution,
-            classify_ground=classify_ground,
-            coordinate_reference_system=coordinate_reference_system,
-            outlier_filter=outlier_filter,
-            outlier_mean_k=outlier_mean_k,
-            outlier_multiplier=outlier_multiplier
+            **get_pipeline_options(config, dataset)
         )
         
+        # Skip the dataset if a previous run already completed it
+        unit_hash = job_hash(pipeline, dataset, config)
+        if manifest:
+            completed = manifest.completed_outputs(output_filename, unit_hash)
+            if completed is not None:
+                return completed
+        
         # Run the pipeline
         logger.info(f"Processing dataset: {dataset_name}")
-        success, point_count = run_pdal_pipeline(pipeline, min_points, output_dir)
+        with resolve_ept_source(ept_url, boundary_geojson, config) as ept_source:
+            success, point_count = run_pdal_pipeline(
+                with_ept_source(pipeline, ept_source), min_points, output_dir, config.get('pdal_engine', 'auto'),
+                config.get('stream_mode', 'auto'), config.get('stream_chunk_size', 10000)
+            )
         
         if success:
             # If file exists, return it regardless of point count
             if os.path.exists(output_file):
+                if not apply_year_tagging([output_file], dataset, config):
+                    if manifest:
+                        manifest.record(output_filename, STATUS_FAILED, unit_hash)
+                    return []
+                
                 file_size = os.path.getsize(output_file) / (1024 * 1024)  # Convert to MB
                 logger.info(f"Dataset {dataset_name}: {file_size:.2f} MB, {point_count} points")
+                if manifest:
+                    manifest.record(output_filename, STATUS_COMPLETE, unit_hash, output_file, point_count)
                 return [output_file]
             else:
                 logger.warning(f"Pipeline reported success but output file does not exist: {output_file}")
+                if manifest:
+                    manifest.record(output_filename, STATUS_FAILED, unit_hash)
                 return []
         else:
             logger.info(f"Pipeline failed for dataset {dataset_name}")
+            if manifest:
+                manifest.record(output_filename, STATUS_FAILED, unit_hash)
             return []
     
     except Exception as e:
@@ -649,7 +1851,8 @@ def download_dataset(boundary_geojson: Dict[str, Any], dataset: Dict[str, Any],
 
 
 def download_lidar_data(boundary_geojson: Dict[str, Any], dataset: Dict[str, Any], 
-                       output_dir: str, config: Dict[str, Any], geojson_filename: str = None) -> List[str]:
+                       output_dir: str, config: Dict[str, Any], geojson_filename: str = None,
+                       manifest: Optional[JobManifest] = None) -> List[str]:
     """
     Download LAZ files based on the input boundary.
     
@@ -659,6 +1862,7 @@ def download_lidar_data(boundary_geojson: Dict[str, Any], dataset: Dict[str, Any
         output_dir: Directory to save the LAZ files
         config: Configuration dictionary
         geojson_filename: Optional name to use for the output file (without extension)
+        manifest: Optional job manifest used to record and resume work
         
     Returns:
         list: List of paths to downloaded LAZ files
@@ -666,5 +1870,89 @@ def download_lidar_data(boundary_geojson: Dict[str, Any], dataset: Dict[str, Any
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
     
-    # Download data from the dataset
-    return download_dataset(boundary_geojson, dataset, output_dir, config, geojson_filename)
+    # Download data from the dataset, as parallel tiles if enabled
+    if config.get('tiled'):
+        return download_dataset_tiled(boundary_geojson, dataset, output_dir, config, geojson_filename, manifest)
+    return download_dataset(boundary_geojson, dataset, output_dir, config, geojson_filename, manifest)
+
+
+
+def download_lidar_data_parallel(jobs: List[Dict[str, Any]], output_dir: str,
+                                 config: Dict[str, Any],
+                                 manifest: Optional[JobManifest] = None) -> List[List[str]]:
+    """
+    Run several dataset downloads concurrently.
+    
+    Downloads are spread over a thread pool sized by the ``download_workers``
+    setting (each download spends its time in a PDAL subprocess). Results are
+    returned in job order and a failing download only affects its own entry.
+    
+    Args:
+        jobs: List of dictionaries with 'boundary', 'dataset' and 'filename' keys
+        output_dir: Directory to save the LAZ files
+        config: Configuration dictionary
+        manifest: Optional job manifest shared by all downloads
+        
+    Returns:
+        list: Downloaded LAZ files for each job, in the same order as ``jobs``
+    """
+    if not jobs:
+        return []
+    
+    max_workers = max(1, min(int(config.get('download_workers', 8)), len(jobs)))
+    logger.info(f"Downloading {len(jobs)} datasets with {max_workers} workers")
+    
+    results = [[] for _ in jobs]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                download_lidar_data,
+                boundary_geojson=job['boundary'],
+                dataset=job['dataset'],
+                output_dir=output_dir,
+                config=config,
+                geojson_filename=job['filename'],
+                manifest=manifest
+            ): index
+            for index, job in enumerate(jobs)
+        }
+        
+        for future in concurrent.futures.as_completed(futures):
+            index = futures[future]
+            dataset_name = jobs[index]['dataset'].get('name', 'unknown')
+            try:
+                results[index] = future.result() or []
+            except Exception as e:
+                logger.error(f"Download failed for dataset {dataset_name}: {str(e)}")
+                results[index] = []
+    
+    return results
+
+
+def plan_lidar_downloads(jobs: List[Dict[str, Any]], config: Dict[str, Any]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Estimate the points, bytes and EPT node fetches of several downloads.
+    
+    The EPT metadata of the jobs is read concurrently with the
+    ``download_workers`` setting; no point data is downloaded.
+    
+    Args:
+        jobs: List of dictionaries with 'boundary', 'dataset' and 'filename' keys
+        config: Configuration dictionary
+        
+    Returns:
+        list: Plan dictionary (see plan_ept_download) or None for each job, in job order
+    """
+    if not jobs:
+        return []
+    
+    def plan_job(job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        s3_url = job['dataset'].get('s3_url')
+        if not s3_url:
+            logger.warning(f"No S3 URL found for dataset {job['dataset'].get('name', 'unknown')}")
+            return None
+        return plan_ept_download(get_ept_url(s3_url, config), job['boundary'], config.get('resolution'))
+    
+    max_workers = max(1, min(int(config.get('download_workers', 8)), len(jobs)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(plan_job, jobs))
@@ -0,0 +1,660 @@
+#!/usr/bin/env python3
+"""
+USGS LiDAR EPT Module
+
+This module reads Entwine Point Tile (EPT) metadata - ept.json and the
+ept-hierarchy octree documents - through a shared, pooled HTTP session and
+a persistent metadata cache, uses it to estimate how much data a request
+will pull before running it, and mirrors EPT data nodes into a local cache.
+"""
+
+import os
+import json
+import math
+import hashlib
+import logging
+import threading
+import concurrent.futures
+from collections import OrderedDict
+from urllib.parse import urlparse
+import requests
+import geopandas as gpd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from shapely.geometry import box
+from shapely.prepared import prep
+from typing import List, Dict, Any, Optional, Union, Tuple
+
+from .boundaries import boundary_geometry
+from .cache import DiskCache
+from .scheduler import get_scheduler
+from .config import DEFAULT_CONFIG, get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Directories of an EPT dataset next to ept.json
+EPT_HIERARCHY_DIR = "ept-hierarchy"
+EPT_DATA_DIR = "ept-data"
+
+# Key of the octree root node
+EPT_ROOT_KEY = "0-0-0-0"
+
+# File extension of the point data nodes for each EPT dataType
+EPT_DATA_EXTENSIONS = {"laszip": "laz", "binary": "bin", "zstandard": "zst"}
+
+# Assumed LAZ compression ratio when the size of a node cannot be measured
+LAZ_COMPRESSION_RATIO = 5.0
+
+# HTTP status codes that are retried
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Shared HTTP session for all metadata requests of a run and its settings
+_http_session: Optional[requests.Session] = None
+_http_settings: Dict[str, Any] = {
+    key: DEFAULT_CONFIG[key] for key in ('http_pool_size', 'http_retries', 'http_backoff', 'http_timeout')
+}
+_http_lock = threading.Lock()
+
+# Directory of the EPT metadata cache inside the cache directory
+EPT_METADATA_CACHE_DIRNAME = "ept-metadata"
+
+# Parsed EPT documents kept in memory, most recently used last
+EPT_MEMORY_CACHE_ENTRIES = 1024
+_metadata_memory: "OrderedDict[str, Any]" = OrderedDict()
+_metadata_lock = threading.Lock()
+
+# On-disk EPT metadata cache, created on first use
+_metadata_cache: Optional[DiskCache] = None
+_metadata_cache_config: Dict[str, Any] = {}
+
+# Directory of the EPT node mirror inside the cache directory
+EPT_NODE_CACHE_DIRNAME = "ept-nodes"
+
+# Bytes read at a time when downloading EPT nodes
+EPT_NODE_CHUNK_SIZE = 256 * 1024
+
+# On-disk EPT node cache, created on first use
+_node_cache: Optional[DiskCache] = None
+_node_cache_lock = threading.Lock()
+
+
+def configure_ept(config: Dict[str, Any]) -> None:
+    """
+    Apply the HTTP and metadata cache settings of a configuration.
+
+    The current HTTP session and metadata cache, if any, are rebuilt on next use.
+
+    Args:
+        config: Configuration dictionary
+    """
+    global _http_session, _metadata_cache, _metadata_cache_config
+    with _http_lock:
+        for key in _http_settings:
+            if config.get(key) is not None:
+                _http_settings[key] = config[key]
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
+    with _metadata_lock:
+        _metadata_cache = None
+        _metadata_cache_config = dict(config)
+
+
+def get_metadata_cache() -> Optional[DiskCache]:
+    """
+    Get the on-disk cache of EPT metadata documents.
+
+    Returns:
+        DiskCache: Shared cache, or None if ``ept_cache_size`` is 0
+    """
+    global _metadata_cache
+    with _metadata_lock:
+        max_bytes = _metadata_cache_config.get('ept_cache_size', DEFAULT_CONFIG['ept_cache_size'])
+        if _metadata_cache is None and max_bytes:
+            directory = os.path.join(get_cache_dir(_metadata_cache_config), EPT_METADATA_CACHE_DIRNAME)
+            _metadata_cache = DiskCache(directory, max_bytes)
+        return _metadata_cache
+
+
+def _remember_metadata(url: str, document: Any) -> None:
+    """Store a parsed document in the in-memory layer, dropping the oldest."""
+    with _metadata_lock:
+        _metadata_memory[url] = document
+        _metadata_memory.move_to_end(url)
+        while len(_metadata_memory) > EPT_MEMORY_CACHE_ENTRIES:
+            _metadata_memory.popitem(last=False)
+
+
+def get_http_session() -> requests.Session:
+    """
+    Get the HTTP session shared by all EPT metadata requests.
+
+    The session keeps connections alive in a pool sized for concurrent
+    fetches and retries failed requests with exponential backoff.
+
+    Returns:
+        requests.Session: Shared session
+    """
+    global _http_session
+    with _http_lock:
+        if _http_session is None:
+            retry = Retry(
+                total=_http_settings['http_retries'],
+                backoff_factor=_http_settings['http_backoff'],
+                status_forcelist=HTTP_RETRY_STATUSES,
+                allowed_methods=("GET", "HEAD")
+            )
+            adapter = HTTPAdapter(
+                pool_connections=_http_settings['http_pool_size'],
+                pool_maxsize=_http_settings['http_pool_size'],
+                max_retries=retry
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def fetch_ept_json(url: str) -> Optional[Any]:
+    """
+    Fetch and parse an EPT JSON document (ept.json or a hierarchy file).
+
+    Documents are looked up in memory, then in the on-disk metadata cache,
+    and only fetched over HTTP on a miss.
+
+    Args:
+        url: URL of the JSON document
+
+    Returns:
+        Parsed JSON or None if the request failed
+    """
+    # Local mirrors are read directly
+    if not url.startswith(("http://", "https://")):
+        try:
+            with open(url, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading EPT metadata from {url}: {str(e)}")
+            return None
+
+    with _metadata_lock:
+        if url in _metadata_memory:
+            _metadata_memory.move_to_end(url)
+            return _metadata_memory[url]
+
+    # EPT documents are immutable, so cached copies never need revalidation
+    cache = get_metadata_cache()
+    digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    cache_key = f"{digest[:2]}/{digest}.json"
+    if cache is not None:
+        data = cache.get(cache_key)
+        if data is not None:
+            try:
+                document = json.loads(data)
+                _remember_metadata(url, document)
+                return document
+            except ValueError:
+                logger.warning(f"Ignoring corrupt cached EPT metadata for {url}")
+
+    try:
+        scheduler = get_scheduler()
+        with scheduler.http.hold():
+            response = get_http_session().get(url, timeout=_http_settings['http_timeout'])
+            response.raise_for_status()
+        scheduler.bandwidth.consume(len(response.content))
+        document = response.json()
+        if cache is not None:
+            cache.put(cache_key, response.content)
+        _remember_metadata(url, document)
+        return document
+    except Exception as e:
+        logger.error(f"Error fetching EPT metadata from {url}: {str(e)}")
+        return None
+
+
+def ept_base_url(ept_url: str) -> str:
+    """Return the dataset root URL of an ept.json URL."""
+    return ept_url.rsplit("/", 1)[0]
+
+
+def get_ept_srs(ept_info: Dict[str, Any]) -> Optional[str]:
+    """
+    Get the spatial reference of an EPT dataset.
+
+    Args:
+        ept_info: Parsed ept.json
+
+    Returns:
+        str: "AUTHORITY:CODE" or WKT, None if the dataset has no SRS
+    """
+    srs = ept_info.get('srs') or {}
+    if srs.get('authority') and srs.get('horizontal'):
+        return f"{srs['authority']}:{srs['horizontal']}"
+    return srs.get('wkt')
+
+
+def ept_depth_end(ept_info: Dict[str, Any], resolution: Optional[Union[float, str]]) -> Optional[int]:
+    """
+    Get the first octree depth that readers.ept skips for a resolution.
+
+    Mirrors the depth selection of readers.ept: the deepest level read is the
+    first one whose cell size (cube width / span / 2^depth) is finer than the
+    requested resolution.
+
+    Args:
+        ept_info: Parsed ept.json
+        resolution: Resolution in SRS units, None or 'full' for all depths
+
+    Returns:
+        int: Exclusive depth limit, or None to read all depths
+    """
+    if resolution is None or resolution == "full":
+        return None
+    try:
+        resolution = float(resolution)
+    except (ValueError, TypeError):
+        return None
+    if resolution <= 0:
+        return None
+
+    bounds = ept_info['bounds']
+    width = bounds[3] - bounds[0]
+    span = ept_info.get('span', 128)
+    return max(1, math.ceil(math.log2(width / span / resolution)) + 1)
+
+
+def ept_node_bounds(key: str, bounds: List[float]) -> Tuple[float, float, float, float]:
+    """
+    Get the 2D bounds of an octree node.
+
+    Args:
+        key: Node key "D-X-Y-Z"
+        bounds: Cubic dataset bounds [minx, miny, minz, maxx, maxy, maxz]
+
+    Returns:
+        tuple: (minx, miny, maxx, maxy) of the node
+    """
+    depth, x, y, _ = (int(part) for part in key.split("-"))
+    step = (bounds[3] - bounds[0]) / (2 ** depth)
+    minx = bounds[0] + x * step
+    miny = bounds[1] + y * step
+    return minx, miny, minx + step, miny + step
+
+
+def estimate_bytes_per_point(ept_url: str, ept_info: Dict[str, Any], root_count: int) -> float:
+    """
+    Estimate the transferred bytes per point of an EPT dataset.
+
+    The size of the root node is measured with a HEAD request; if that fails
+    the uncompressed point size from the schema is used, divided by
+    LAZ_COMPRESSION_RATIO for LAZ data.
+
+    Args:
+        ept_url: URL of the dataset's ept.json
+        ept_info: Parsed ept.json
+        root_count: Number of points in the root node
+
+    Returns:
+        float: Estimated bytes per point
+    """
+    data_type = ept_info.get('dataType', 'laszip')
+    extension = EPT_DATA_EXTENSIONS.get(data_type, 'laz')
+
+    if root_count > 0:
+        url = f"{ept_base_url(ept_url)}/{EPT_DATA_DIR}/{EPT_ROOT_KEY}.{extension}"
+        try:
+            with get_scheduler().http.hold():
+                response = get_http_session().head(url, timeout=_http_settings['http_timeout'])
+            response.raise_for_status()
+            size = int(response.headers.get('Content-Length', 0))
+            if size > 0:
+                return size / root_count
+        except Exception as e:
+            logger.warning(f"Could not measure EPT node size from {url}: {str(e)}")
+
+    point_size = sum(dim.get('size', 0) for dim in ept_info.get('schema', [])) or 34
+    if data_type == 'laszip':
+        return point_size / LAZ_COMPRESSION_RATIO
+    return float(point_size)
+
+
+def ept_area(ept_info: Dict[str, Any], boundary_geojson: Dict[str, Any]):
+    """
+    Get the boundary as a single geometry in the SRS of an EPT dataset.
+
+    Args:
+        ept_info: Parsed ept.json
+        boundary_geojson: GeoJSON boundary as a dictionary
+
+    Returns:
+        Shapely geometry in the dataset SRS, or None if the boundary is empty
+    """
+    area = boundary_geometry(boundary_geojson)
+    if area is None:
+        return None
+    srs = get_ept_srs(ept_info)
+    if srs:
+        area = gpd.GeoSeries([area], crs="EPSG:4326").to_crs(srs).iloc[0]
+    return area
+
+
+def collect_ept_nodes(ept_url: str, ept_info: Dict[str, Any], area,
+                      depth_end: Optional[int]) -> Optional[Tuple[Dict[str, int], int]]:
+    """
+    Find the data nodes of an EPT dataset that intersect an area.
+
+    Walks the ept-hierarchy documents, only descending into subtrees that
+    intersect the area above ``depth_end``.
+
+    Args:
+        ept_url: URL of the dataset's ept.json
+        ept_info: Parsed ept.json
+        area: Shapely geometry in the dataset SRS
+        depth_end: Exclusive depth limit, None for all depths
+
+    Returns:
+        tuple: (point count per node key, number of hierarchy documents read),
+               or None if a hierarchy document could not be read
+    """
+    prepared_area = prep(area)
+    bounds = ept_info['bounds']
+    hierarchy_url = f"{ept_base_url(ept_url)}/{EPT_HIERARCHY_DIR}"
+
+    nodes = {}
+    fetches = 0
+    pending = [EPT_ROOT_KEY]
+    while pending:
+        hierarchy = fetch_ept_json(f"{hierarchy_url}/{pending.pop()}.json")
+        if hierarchy is None:
+            return None
+        fetches += 1
+
+        for key, count in hierarchy.items():
+            if depth_end is not None and int(key.split("-", 1)[0]) >= depth_end:
+                continue
+            if not prepared_area.intersects(box(*ept_node_bounds(key, bounds))):
+                continue
+            if count == -1:
+                # Subtree stored in its own hierarchy document
+                pending.append(key)
+            elif count > 0:
+                nodes[key] = count
+
+    return nodes, fetches
+
+
+def plan_ept_download(ept_url: str, boundary_geojson: Dict[str, Any],
+                      resolution: Optional[Union[float, str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Estimate what an EPT extraction for a boundary will fetch.
+
+    Whole nodes are fetched by readers.ept, so bytes and node counts cover
+    every intersecting node, while estimated points are scaled by the
+    fraction of each node that lies inside the boundary.
+
+    Args:
+        ept_url: URL of the dataset's ept.json
+        boundary_geojson: GeoJSON boundary as a dictionary
+        resolution: Resolution in SRS units, None or 'full' for all depths
+
+    Returns:
+        dict: Plan with points, node_points, bytes, nodes, hierarchy_fetches
+              and depth_end, or None if the metadata could not be read
+    """
+    try:
+        ept_info = fetch_ept_json(ept_url)
+        if not ept_info or 'bounds' not in ept_info:
+            logger.error(f"Invalid EPT metadata at {ept_url}")
+            return None
+
+        area = ept_area(ept_info, boundary_geojson)
+        if area is None:
+            return None
+
+        depth_end = ept_depth_end(ept_info, resolution)
+        collected = collect_ept_nodes(ept_url, ept_info, area, depth_end)
+        if collected is None:
+            return None
+        nodes, fetches = collected
+
+        prepared_area = prep(area)
+        points = 0
+        for key, count in nodes.items():
+            node_box = box(*ept_node_bounds(key, ept_info['bounds']))
+            if prepared_area.contains(node_box):
+                points += count
+            else:
+                points += int(count * area.intersection(node_box).area / node_box.area)
+
+        node_points = sum(nodes.values())
+        bytes_per_point = estimate_bytes_per_point(ept_url, ept_info, nodes.get(EPT_ROOT_KEY, 0))
+        return {
+            'points': points,
+            'node_points': node_points,
+            'bytes': int(node_points * bytes_per_point),
+            'nodes': len(nodes),
+            'hierarchy_fetches': fetches,
+            'depth_end': depth_end
+        }
+
+    except Exception as e:
+        logger.error(f"Error planning EPT download from {ept_url}: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return None
+
+
+def load_point_density(ept_url: str, boundary_geojson: Dict[str, Any],
+                       resolution: Optional[Union[float, str]] = None) -> Optional[gpd.GeoDataFrame]:
+    """
+    Get the point counts of the EPT nodes covering a boundary.
+    
+    Every point of an EPT dataset is stored in exactly one node, so summing
+    the counts of the nodes a region overlaps (weighted by the overlap)
+    estimates the points in that region.
+    
+    Args:
+        ept_url: URL of the dataset's ept.json
+        boundary_geojson: GeoJSON boundary as a dictionary
+        resolution: Resolution in SRS units, None or 'full' for all depths
+        
+    Returns:
+        GeoDataFrame: One row per node with 'key', 'count' and its 2D box
+                      in the dataset SRS, or None if the metadata could not be read
+    """
+    try:
+        ept_info = fetch_ept_json(ept_url)
+        if not ept_info or 'bounds' not in ept_info:
+            logger.error(f"Invalid EPT metadata at {ept_url}")
+            return None
+        
+        area = ept_area(ept_info, boundary_geojson)
+        if area is None:
+            return None
+        
+        collected = collect_ept_nodes(ept_url, ept_info, area, ept_depth_end(ept_info, resolution))
+        if collected is None:
+            return None
+        nodes, _ = collected
+        
+        keys = list(nodes)
+        return gpd.GeoDataFrame(
+            {'key': keys, 'count': [nodes[key] for key in keys]},
+            geometry=[box(*ept_node_bounds(key, ept_info['bounds'])) for key in keys],
+            crs=get_ept_srs(ept_info)
+        )
+    
+    except Exception as e:
+        logger.error(f"Error loading EPT point density from {ept_url}: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return None
+
+
+def get_node_cache(config: Dict[str, Any]) -> DiskCache:
+    """
+    Get the on-disk cache of EPT data nodes.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        DiskCache: Node cache in ``ept-nodes`` inside the cache directory
+    """
+    global _node_cache
+    directory = os.path.join(get_cache_dir(config), EPT_NODE_CACHE_DIRNAME)
+    max_bytes = config.get('ept_node_cache_size', DEFAULT_CONFIG['ept_node_cache_size'])
+    with _node_cache_lock:
+        if _node_cache is None or _node_cache.directory != directory or _node_cache.max_bytes != max_bytes:
+            _node_cache = DiskCache(directory, max_bytes)
+        return _node_cache
+
+
+def _fetch_ept_node(url: str) -> Optional[bytes]:
+    """Download one EPT data node."""
+    try:
+        if not url.startswith(("http://", "https://")):
+            with open(url, "rb") as f:
+                return f.read()
+        scheduler = get_scheduler()
+        chunks = []
+        with scheduler.http.hold():
+            with get_http_session().get(url, timeout=_http_settings['http_timeout'], stream=True) as response:
+                response.raise_for_status()
+                # Pass the transfer through the bandwidth limiter as it arrives
+                for chunk in response.iter_content(EPT_NODE_CHUNK_SIZE):
+                    scheduler.bandwidth.consume(len(chunk))
+                    chunks.append(chunk)
+        return b"".join(chunks)
+    except Exception as e:
+        logger.error(f"Error fetching EPT node {url}: {str(e)}")
+        return None
+
+
+def mirror_ept_dataset(ept_url: str, boundary_geojson: Dict[str, Any],
+                       resolution: Optional[Union[float, str]],
+                       config: Dict[str, Any]) -> Optional[Tuple[str, List[str]]]:
+    """
+    Mirror the EPT nodes an extraction needs into the local node cache.
+
+    The mirror is a directory per dataset path holding ept.json, a single
+    ept-hierarchy/0-0-0-0.json and the ept-data nodes. Nodes intersecting the
+    bounding box of the boundary above the resolution depth limit are
+    downloaded unless already cached, so overlapping extractions from
+    different jobs become disk reads.
+
+    The mirror's files are pinned in the node cache so neither this job nor
+    a parallel one evicts them while readers.ept reads them; the caller
+    releases them with release_ept_mirror() once the pipeline has run. If a
+    node the extraction needs is not on disk after fetching, the mirror
+    fails rather than serving a partial point cloud. The mirrored hierarchy
+    lists every node of this extraction plus the nodes of earlier
+    extractions that are still on disk.
+
+    Args:
+        ept_url: URL of the dataset's ept.json
+        boundary_geojson: GeoJSON boundary as a dictionary
+        resolution: Resolution in SRS units, None or 'full' for all depths
+        config: Configuration dictionary
+
+    Returns:
+        tuple: Path of the mirrored ept.json and the pinned cache keys,
+               or None if the mirror could not be built
+    """
+    cache = None
+    pinned = []
+    try:
+        ept_info = fetch_ept_json(ept_url)
+        if not ept_info or 'bounds' not in ept_info:
+            logger.error(f"Invalid EPT metadata at {ept_url}")
+            return None
+
+        area = ept_area(ept_info, boundary_geojson)
+        if area is None:
+            return None
+
+        # readers.ept selects nodes by the boundary's extent, so mirror
+        # everything under the bounding box
+        collected = collect_ept_nodes(ept_url, ept_info, box(*area.bounds),
+                                      ept_depth_end(ept_info, resolution))
+        if collected is None:
+            return None
+        nodes, _ = collected
+
+        cache = get_node_cache(config)
+        dataset_key = urlparse(ept_base_url(ept_url)).path.strip("/")
+        extension = EPT_DATA_EXTENSIONS.get(ept_info.get('dataType', 'laszip'), 'laz')
+        data_url = f"{ept_base_url(ept_url)}/{EPT_DATA_DIR}"
+        hierarchy_key = f"{dataset_key}/{EPT_HIERARCHY_DIR}/{EPT_ROOT_KEY}.json"
+        ept_key = f"{dataset_key}/ept.json"
+
+        def node_key(key: str) -> str:
+            return f"{dataset_key}/{EPT_DATA_DIR}/{key}.{extension}"
+
+        # Pin before checking the cache so no node is evicted between the check and the read
+        pinned = [node_key(key) for key in nodes] + [hierarchy_key, ept_key]
+        cache.pin(pinned)
+
+        missing = [key for key in nodes if not cache.touch(node_key(key))]
+        logger.info(f"EPT node cache: {len(nodes) - len(missing)} of {len(nodes)} nodes cached for {dataset_key}")
+
+        def cache_node(key: str) -> bool:
+            data = _fetch_ept_node(f"{data_url}/{key}.{extension}")
+            return data is not None and cache.put(node_key(key), data) is not None
+
+        if missing:
+            workers = max(1, min(int(_http_settings['http_pool_size']), len(missing)))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                if not all(executor.map(cache_node, missing)):
+                    logger.error(f"Could not cache all EPT nodes for {dataset_key}")
+                    cache.unpin(pinned)
+                    return None
+
+        absent = [key for key in nodes if not os.path.exists(cache.path(node_key(key)))]
+        if absent:
+            logger.error(f"{len(absent)} of {len(nodes)} EPT nodes needed for {dataset_key} "
+                         f"are missing from the node cache")
+            cache.unpin(pinned)
+            return None
+
+        with _node_cache_lock:
+            # Merge with nodes mirrored by earlier jobs; those no longer on
+            # disk are outside this extraction and are dropped
+            hierarchy = {}
+            existing = cache.get(hierarchy_key)
+            if existing is not None:
+                try:
+                    hierarchy = json.loads(existing)
+                except ValueError:
+                    hierarchy = {}
+            hierarchy = {key: count for key, count in hierarchy.items() if os.path.exists(cache.path(node_key(key)))}
+            hierarchy.update(nodes)
+
+            hierarchy_path = cache.put(hierarchy_key, json.dumps(hierarchy).encode('utf-8'))
+            ept_path = cache.put(ept_key, json.dumps(ept_info).encode('utf-8'))
+
+        if hierarchy_path is None or ept_path is None:
+            logger.error(f"Could not write the EPT mirror metadata for {dataset_key}")
+            cache.unpin(pinned)
+            return None
+        return ept_path, pinned
+
+    except Exception as e:
+        logger.error(f"Error mirroring EPT dataset {ept_url}: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        if cache is not None:
+            cache.unpin(pinned)
+        return None
+
+
+def release_ept_mirror(pinned: List[str], config: Dict[str, Any]) -> None:
+    """
+    Release the node cache entries pinned by mirror_ept_dataset().
+
+    Args:
+        pinned: Cache keys returned by mirror_ept_dataset()
+        config: Configuration dictionary
+    """
+    get_node_cache(config).unpin(pinned)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+USGS LiDAR Job Manifest Module
+
+This module records the state of each download unit (dataset or tile) in a
+JSON file in the output directory so interrupted jobs can be resumed.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Unit status values
+STATUS_COMPLETE = "complete"
+STATUS_FAILED = "failed"
+
+
+def pipeline_hash(pipeline: Any) -> str:
+    """
+    Compute a stable hash of a pipeline definition (or any JSON-serializable value).
+
+    Args:
+        pipeline: PDAL pipeline definition
+
+    Returns:
+        str: Hex digest of the canonical JSON representation
+    """
+    canonical = json.dumps(pipeline, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class JobManifest:
+    """
+    Per-job state manifest stored as JSON.
+
+    Every unit of work (a dataset download or a single tile) is recorded with
+    its status, pipeline hash, output files, output size and point count.
+    With ``resume`` enabled, units recorded as complete with the same pipeline
+    hash and unchanged outputs are reported as done so they can be skipped.
+    Updates are thread-safe and written atomically.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        """
+        Load the manifest at ``path`` if it exists.
+
+        Args:
+            path: Path to the manifest JSON file
+            resume: Whether completed units may be skipped
+        """
+        self.path = path
+        self.resume = resume
+        self.units: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self.units = json.load(f).get('units', {})
+                logger.info(f"Loaded job manifest with {len(self.units)} units from {path}")
+            except Exception as e:
+                logger.warning(f"Could not read job manifest {path}: {str(e)}")
+
+    def completed_outputs(self, unit_id: str, unit_hash: str) -> Optional[List[str]]:
+        """
+        Return the outputs of a unit that can be skipped on resume.
+
+        Args:
+            unit_id: Unit identifier
+            unit_hash: Hash of the unit's current pipeline definition
+
+        Returns:
+            list: Output files if the unit is complete and unchanged, None otherwise
+        """
+        if not self.resume:
+            return None
+
+        with self._lock:
+            entry = self.units.get(unit_id)
+        if not entry or entry.get('status') != STATUS_COMPLETE or entry.get('pipeline_hash') != unit_hash:
+            return None
+
+        outputs = entry.get('outputs', [])
+        if not all(os.path.exists(output) for output in outputs):
+            return None
+        if sum(os.path.getsize(output) for output in outputs) != entry.get('size'):
+            return None
+
+        logger.info(f"Skipping completed unit {unit_id}")
+        return outputs
+
+    def record(self, unit_id: str, status: str, unit_hash: Optional[str] = None,
+               outputs: Optional[Union[str, List[str]]] = None,
+               point_count: Optional[int] = None) -> None:
+        """
+        Record the state of a unit and save the manifest.
+
+        Args:
+            unit_id: Unit identifier
+            status: Unit status (STATUS_COMPLETE or STATUS_FAILED)
+            unit_hash: Hash of the unit's pipeline definition
+            outputs: Output file or files produced by the unit
+            point_count: Number of points written
+        """
+        if isinstance(outputs, str):
+            outputs = [outputs]
+        outputs = [output for output in (outputs or []) if os.path.exists(output)]
+
+        entry = {
+            'status': status,
+            'pipeline_hash': unit_hash,
+            'outputs': outputs,
+            'size': sum(os.path.getsize(output) for output in outputs),
+            'point_count': point_count,
+            'updated_at': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+        with self._lock:
+            self.units[unit_id] = entry
+            self._save()
+
+    def _save(self) -> None:
+        """Write the manifest atomically (the caller holds the lock)."""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump({'units': self.units}, f, indent=4)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Could not save job manifest {self.path}: {str(e)}")
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+USGS LiDAR Scheduler Module
+
+This module coordinates the work of all parallel dataset and tile downloads
+of a run under shared budgets: CPU workers for PDAL executions, in-flight
+HTTP requests to S3 and aggregate download bandwidth. It also collects
+queue depth and utilization metrics for each budget.
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Iterator
+
+from .config import DEFAULT_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class Budget:
+    """
+    Counting budget with a FIFO queue of waiters.
+
+    Tracks the number of queued and running holders and the slot-seconds in
+    use, from which utilization over the lifetime of the budget is derived.
+    """
+
+    def __init__(self, name: str, capacity: int):
+        """
+        Create a budget.
+
+        Args:
+            name: Name used in metrics and logs
+            capacity: Number of slots
+        """
+        self.name = name
+        self.capacity = max(1, capacity)
+        self.in_use = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.acquired = 0
+        self.wait_seconds = 0.0
+        self._busy_seconds = 0.0
+        self._last_change = time.monotonic()
+        self._started = self._last_change
+        self._next_ticket = 0
+        self._serving = 0
+        self._condition = threading.Condition()
+
+    def _account(self) -> None:
+        """Add the slot-seconds used since the last change (the caller holds the lock)."""
+        now = time.monotonic()
+        self._busy_seconds += self.in_use * (now - self._last_change)
+        self._last_change = now
+
+    @contextmanager
+    def hold(self, slots: int = 1) -> Iterator[None]:
+        """
+        Hold ``slots`` slots, waiting in FIFO order until they are free.
+
+        Requests larger than the capacity hold the whole budget.
+
+        Args:
+            slots: Number of slots to hold (0 does not wait)
+        """
+        slots = min(slots, self.capacity)
+        if slots <= 0:
+            yield
+            return
+
+        start = time.monotonic()
+        with self._condition:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+            while ticket != self._serving or self.in_use + slots > self.capacity:
+                self._condition.wait()
+            self._account()
+            self.queued -= 1
+            self.in_use += slots
+            self.acquired += 1
+            self.wait_seconds += time.monotonic() - start
+            self._serving += 1
+            self._condition.notify_all()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._account()
+                self.in_use -= slots
+                self._condition.notify_all()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get the current metrics of the budget.
+
+        Returns:
+            dict: capacity, in_use, queued, peak_queued, acquired,
+                  wait_seconds and utilization (0-1)
+        """
+        with self._condition:
+            self._account()
+            elapsed = self._last_change - self._started
+            return {
+                'capacity': self.capacity,
+                'in_use': self.in_use,
+                'queued': self.queued,
+                'peak_queued': self.peak_queued,
+                'acquired': self.acquired,
+                'wait_seconds': self.wait_seconds,
+                'utilization': self._busy_seconds / (self.capacity * elapsed) if elapsed > 0 else 0.0
+            }
+
+
+class BandwidthLimiter:
+    """
+    Token bucket limiting the aggregate bytes per second of all transfers.
+    """
+
+    def __init__(self, bytes_per_second: Optional[float]):
+        """
+        Create a limiter.
+
+        Args:
+            bytes_per_second: Rate limit, None for unlimited
+        """
+        self.rate = bytes_per_second
+        self.total_bytes = 0
+        self.throttled_seconds = 0.0
+        self._tokens = bytes_per_second or 0.0
+        self._last = time.monotonic()
+        self._started = self._last
+        self._lock = threading.Lock()
+
+    def consume(self, nbytes: int) -> None:
+        """
+        Account for ``nbytes`` transferred, sleeping when over the rate.
+
+        Args:
+            nbytes: Number of bytes transferred
+        """
+        with self._lock:
+            self.total_bytes += nbytes
+            if not self.rate:
+                return
+            now = time.monotonic()
+            # Allow bursts of up to one second of transfer
+            self._tokens = min(self.rate, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= nbytes
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.throttled_seconds += delay
+        if delay:
+            time.sleep(delay)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get the current metrics of the limiter.
+
+        Returns:
+            dict: limit_bytes_per_second, total_bytes, bytes_per_second and throttled_seconds
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            return {
+                'limit_bytes_per_second': self.rate,
+                'total_bytes': self.total_bytes,
+                'bytes_per_second': self.total_bytes / elapsed if elapsed > 0 else 0.0,
+                'throttled_seconds': self.throttled_seconds
+            }
+
+
+class Scheduler:
+    """
+    Shared budgets for all downloads of a run.
+
+    PDAL executions hold a CPU slot; pipelines reading EPT over HTTP also
+    hold one HTTP slot per readers.ept fetch thread. Metadata and node cache
+    requests made by the tool hold one HTTP slot each and pass their bytes
+    through the bandwidth limiter. Jobs waiting for a slot are served in
+    arrival order.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Create the budgets from a configuration.
+
+        Args:
+            config: Configuration dictionary (defaults when None)
+        """
+        config = config or {}
+        cpu_workers = config.get('cpu_workers') or os.cpu_count() or 1
+        http_requests = config.get('max_http_requests') or DEFAULT_CONFIG['max_http_requests']
+        bandwidth = config.get('max_bandwidth_mbps')
+
+        self.cpu = Budget("cpu", cpu_workers)
+        self.http = Budget("http", http_requests)
+        self.bandwidth = BandwidthLimiter(bandwidth * 1024 * 1024 if bandwidth else None)
+        self.ept_reader_threads = min(
+            config.get('ept_reader_threads') or DEFAULT_CONFIG['ept_reader_threads'],
+            self.http.capacity
+        )
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get the metrics of every budget.
+
+        Returns:
+            dict: Metrics keyed by 'cpu', 'http' and 'bandwidth'
+        """
+        return {
+            'cpu': self.cpu.metrics(),
+            'http': self.http.metrics(),
+            'bandwidth': self.bandwidth.metrics()
+        }
+
+    def log_metrics(self) -> None:
+        """Log a summary of the scheduler metrics."""
+        metrics = self.metrics()
+        for name in ('cpu', 'http'):
+            budget = metrics[name]
+            logger.info(f"Scheduler {name}: {budget['capacity']} slots, "
+                        f"{budget['utilization'] * 100:.1f}% utilized, {budget['acquired']} jobs, "
+                        f"peak queue {budget['peak_queued']}, {budget['wait_seconds']:.1f}s waited")
+        bandwidth = metrics['bandwidth']
+        limit = bandwidth['limit_bytes_per_second']
+        logger.info(f"Scheduler bandwidth: {bandwidth['total_bytes'] / (1024 * 1024):.1f} MB at "
+                    f"{bandwidth['bytes_per_second'] / (1024 * 1024):.2f} MB/s "
+                    f"(limit: {f'{limit / (1024 * 1024):.2f} MB/s' if limit else 'none'}, "
+                    f"{bandwidth['throttled_seconds']:.1f}s throttled)")
+
+
+# Scheduler shared by all downloads of a run
+_scheduler: Optional[Scheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def configure_scheduler(config: Dict[str, Any]) -> Scheduler:
+    """
+    Replace the shared scheduler with one built from a configuration.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        Scheduler: The new shared scheduler
+    """
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = Scheduler(config)
+        return _scheduler
+
+
+def get_scheduler() -> Scheduler:
+    """
+    Get the shared scheduler, creating one with default budgets if needed.
+
+    Returns:
+        Scheduler: Shared scheduler
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+        return _scheduler
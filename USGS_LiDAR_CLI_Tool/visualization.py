@@ -71,9 +71,9 @@ def create_coverage_map(boundary_geojson: Dict[str, Any],
         dataset_geometries = []
         boundary_geometry = None
         
-        # Extract boundary geometry
+        # Extract boundary geometry (all features combined)
         if boundary_gdf is not None:
-            boundary_geometry = boundary_gdf.geometry.iloc[0]
+            boundary_geometry = unary_union(boundary_gdf.geometry.values)
         
         # If we have a list of downloaded datasets, filter the visualization to show only those
         filtered_datasets = datasets
@@ -370,11 +370,13 @@ def verify_dataset_coverage(boundary_geojson: Dict[str, Any],
         dict: Coverage statistics and information
     """
     try:
-        # Extract boundary geometry
+        # Extract boundary geometry (all features combined)
         boundary_geometry = None
         if boundary_geojson.get('type') == 'FeatureCollection':
-            if boundary_geojson.get('features') and len(boundary_geojson['features']) > 0:
-                boundary_geometry = shape(boundary_geojson['features'][0].get('geometry'))
+            geometries = [shape(feature['geometry']) for feature in boundary_geojson.get('features') or []
+                          if feature.get('geometry')]
+            if geometries:
+                boundary_geometry = unary_union(geometries)
         elif boundary_geojson.get('type') == 'Feature':
             boundary_geometry = shape(boundary_geojson.get('geometry'))
         elif boundary_geojson.get('type') in ['Polygon', 'MultiPolygon']:
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-load time and peak RSS of the dataset catalog formats.
+
+Each format is loaded in a fresh Python process so neither the in-memory
+catalog caches nor a previously loaded format affect the measurement.
+
+Usage:
+    python benchmarks/catalog_load.py [--geojson resources.geojson] [--parquet catalog.parquet] [--repeat 3]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from USGS_LiDAR_CLI_Tool.config import get_cache_dir
+from USGS_LiDAR_CLI_Tool.boundaries import (
+    CATALOG_PARQUET_FILENAME,
+    build_usgs_catalog, export_catalog_parquet, fetch_usgs_boundaries, load_catalog_parquet
+)
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def run_single(fmt: str, path: str) -> None:
+    """Load one catalog format and print the measurement as JSON."""
+    start = time.perf_counter()
+    if fmt == "json":
+        with open(path, "r") as f:
+            catalog = build_usgs_catalog(json.load(f))
+    else:
+        catalog = load_catalog_parquet(path)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "format": fmt,
+        "datasets": len(catalog) if catalog is not None else 0,
+        "seconds": elapsed,
+        "peak_rss_mb": peak_rss_mb()
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare catalog cold-load time and RSS")
+    parser.add_argument("--geojson", type=str, help="Boundaries GeoJSON (default: cached copy)")
+    parser.add_argument("--parquet", type=str, help="GeoParquet catalog (default: exported into the cache)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per format (default: 3)")
+    parser.add_argument("--single", choices=["json", "parquet"], help=argparse.SUPPRESS)
+    parser.add_argument("--path", type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(args.single, args.path)
+        return 0
+
+    geojson_path = args.geojson or fetch_usgs_boundaries()
+    if not geojson_path or not os.path.exists(geojson_path):
+        print("No boundaries GeoJSON available", file=sys.stderr)
+        return 1
+
+    parquet_path = args.parquet or os.path.join(get_cache_dir(), CATALOG_PARQUET_FILENAME)
+    if not os.path.exists(parquet_path):
+        with open(geojson_path, "r") as f:
+            catalog = build_usgs_catalog(json.load(f))
+        if catalog is None or not export_catalog_parquet(catalog, parquet_path):
+            print("Could not export GeoParquet catalog", file=sys.stderr)
+            return 1
+
+    results = {}
+    for fmt, path in (("json", geojson_path), ("parquet", parquet_path)):
+        runs = []
+        for _ in range(args.repeat):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--single", fmt, "--path", path],
+                capture_output=True, text=True, check=True
+            )
+            runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+        results[fmt] = runs
+
+    print(f"{'format':<10}{'size MB':>10}{'datasets':>10}{'best s':>10}{'peak RSS MB':>14}")
+    for fmt, path in (("json", geojson_path), ("parquet", parquet_path)):
+        runs = results[fmt]
+        print(f"{fmt:<10}{os.path.getsize(path) / (1024 * 1024):>10.1f}{runs[0]['datasets']:>10}"
+              f"{min(r['seconds'] for r in runs):>10.3f}{max(r['peak_rss_mb'] for r in runs):>14.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark merging tile LAZ files with laspy against pdal merge.
+
+Each engine runs in a fresh Python process so peak RSS is measured per
+engine (for pdal merge, the RSS of the pdal child process). Without --tiles
+a grid of synthetic tiles with shared edge points is generated first.
+
+Usage:
+    python benchmarks/tile_merge.py [--tiles a.laz b.laz ...] [--grid 4] [--points 2000000] [--repeat 3]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from USGS_LiDAR_CLI_Tool.download import merge_laz_tiles, read_las_header
+
+
+def peak_rss_mb(who: int) -> float:
+    """Return the peak resident set size of this process or its children in MB."""
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def edge_points(row: int, col: int, vertical: bool, tile_size: float, count: int = 1000):
+    """Return the x, y, z of the points on one tile edge; both neighbors get the same points."""
+    import numpy as np
+
+    rng = np.random.default_rng([row, col, int(vertical)])
+    along = rng.random(count) * tile_size
+    z = rng.random(count) * 100
+    x0 = 500000.0 + col * tile_size
+    y0 = 4000000.0 + row * tile_size
+    if vertical:
+        return np.full(count, x0), y0 + along, z
+    return x0 + along, np.full(count, y0), z
+
+
+def write_synthetic_tiles(directory: str, grid: int, points: int, tile_size: float = 1000.0) -> list:
+    """Write a grid x grid set of LAZ tiles; points on shared edges are written by both tiles."""
+    import laspy
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    tiles = []
+    for row in range(grid):
+        for col in range(grid):
+            header = laspy.LasHeader(point_format=6, version="1.4")
+            header.scales = [0.01, 0.01, 0.01]
+            header.offsets = [500000.0, 4000000.0, 0.0]
+            minx = 500000.0 + col * tile_size
+            miny = 4000000.0 + row * tile_size
+
+            # Interior points plus the points on all four edges, as an inclusive crop keeps them
+            parts = [(minx + rng.random(points) * tile_size,
+                      miny + rng.random(points) * tile_size,
+                      rng.random(points) * 100)]
+            parts += [edge_points(row, col, True, tile_size), edge_points(row, col + 1, True, tile_size),
+                      edge_points(row, col, False, tile_size), edge_points(row + 1, col, False, tile_size)]
+            x, y, z = (np.concatenate(values) for values in zip(*parts))
+
+            record = laspy.ScaleAwarePointRecord.zeros(len(x), header=header)
+            record.x = x
+            record.y = y
+            record.z = z
+            record.gps_time = np.round(x * 7 + y * 3, 2)
+            record.intensity = rng.integers(0, 65535, len(x))
+
+            path = os.path.join(directory, f"tile_{row}_{col}.laz")
+            with laspy.open(path, mode="w", header=header) as writer:
+                writer.write_points(record)
+            tiles.append(path)
+    return tiles
+
+
+def run_single(engine: str, tiles: list, output: str) -> None:
+    """Merge the tiles with one engine and print the measurement as JSON."""
+    start = time.perf_counter()
+    if engine == "laspy":
+        success = merge_laz_tiles(tiles, output)
+    else:
+        result = subprocess.run(["pdal", "merge"] + tiles + [output], capture_output=True, text=True)
+        success = result.returncode == 0
+    elapsed = time.perf_counter() - start
+
+    header = read_las_header(output) if success else None
+    who = resource.RUSAGE_SELF if engine == "laspy" else resource.RUSAGE_CHILDREN
+    print(json.dumps({
+        "engine": engine,
+        "success": success,
+        "points": header['point_count'] if header else 0,
+        "seconds": elapsed,
+        "output_mb": os.path.getsize(output) / (1024 * 1024) if success else 0.0,
+        "peak_rss_mb": peak_rss_mb(who)
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare tile merging with laspy and pdal merge")
+    parser.add_argument("--tiles", type=str, nargs="+", help="Tile LAZ files (default: generate synthetic tiles)")
+    parser.add_argument("--grid", type=int, default=4, help="Synthetic tile grid size (default: 4)")
+    parser.add_argument("--points", type=int, default=2_000_000, help="Points per synthetic tile (default: 2000000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per engine (default: 3)")
+    parser.add_argument("--single", choices=["laspy", "pdal"], help=argparse.SUPPRESS)
+    parser.add_argument("--output", type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(args.single, args.tiles, args.output)
+        return 0
+
+    engines = ["laspy"] + (["pdal"] if shutil.which("pdal") else [])
+    if len(engines) == 1:
+        print("pdal command not found, only benchmarking laspy", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        tiles = args.tiles
+        if not tiles:
+            print(f"Generating {args.grid}x{args.grid} synthetic tiles with {args.points} points each")
+            tiles = write_synthetic_tiles(temp_dir, args.grid, args.points)
+        input_points = sum(read_las_header(tile)['point_count'] for tile in tiles)
+
+        results = {}
+        for engine in engines:
+            runs = []
+            for run in range(args.repeat):
+                output_path = os.path.join(temp_dir, f"merged_{engine}_{run}.laz")
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--single", engine,
+                     "--output", output_path, "--tiles"] + tiles,
+                    capture_output=True, text=True, check=True
+                )
+                runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+                os.remove(output_path)
+            results[engine] = runs
+
+        print(f"input: {len(tiles)} tiles, {input_points} points")
+        print(f"{'engine':<8}{'points':>12}{'best s':>10}{'Mpts/s':>10}{'output MB':>12}{'peak RSS MB':>14}")
+        for engine, runs in results.items():
+            best = min(r['seconds'] for r in runs)
+            rate = input_points / best / 1e6 if best else 0.0
+            print(f"{engine:<8}{runs[0]['points']:>12}{best:>10.2f}{rate:>10.2f}"
+                  f"{runs[0]['output_mb']:>12.1f}{max(r['peak_rss_mb'] for r in runs):>14.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
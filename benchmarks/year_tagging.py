@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark the chunked Year rewrite on a LAZ file.
+
+Each chunk size is run in a fresh Python process so the peak RSS reported
+for one run is not inflated by a previous one. Without --input a synthetic
+LAZ file with --points points is generated first.
+
+Usage:
+    python benchmarks/year_tagging.py [--input tile.laz] [--points 20000000] [--chunk-sizes 100000 1000000 5000000]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from USGS_LiDAR_CLI_Tool.download import add_year_to_laz
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def write_synthetic_laz(path: str, points: int, chunk_size: int = 1_000_000) -> None:
+    """Write a LAZ file with uniformly random points, chunk by chunk."""
+    import laspy
+    import numpy as np
+
+    header = laspy.LasHeader(point_format=6, version="1.4")
+    header.scales = [0.01, 0.01, 0.01]
+    header.offsets = [500000.0, 4000000.0, 0.0]
+    rng = np.random.default_rng(0)
+
+    with laspy.open(path, mode="w", header=header) as writer:
+        remaining = points
+        while remaining > 0:
+            count = min(chunk_size, remaining)
+            record = laspy.ScaleAwarePointRecord.zeros(count, header=header)
+            record.X = rng.integers(0, 100_000, count)
+            record.Y = rng.integers(0, 100_000, count)
+            record.Z = rng.integers(0, 50_000, count)
+            record.intensity = rng.integers(0, 65535, count)
+            writer.write_points(record)
+            remaining -= count
+
+
+def run_single(path: str, chunk_size: int) -> None:
+    """Tag one file and print the measurement as JSON."""
+    import laspy
+
+    with laspy.open(path) as reader:
+        points = reader.header.point_count
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output = os.path.join(temp_dir, "tagged.laz")
+        start = time.perf_counter()
+        success = add_year_to_laz(path, output, 2020, chunk_size)
+        elapsed = time.perf_counter() - start
+
+        output_points = 0
+        if success:
+            with laspy.open(output) as reader:
+                output_points = reader.header.point_count
+
+    print(json.dumps({
+        "chunk_size": chunk_size,
+        "success": success and output_points == points,
+        "points": points,
+        "output_points": output_points,
+        "seconds": elapsed,
+        "peak_rss_mb": peak_rss_mb()
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure throughput and peak RSS of the chunked Year rewrite")
+    parser.add_argument("--input", type=str, help="LAZ file to tag (default: generate a synthetic file)")
+    parser.add_argument("--points", type=int, default=20_000_000,
+                        help="Points in the synthetic file (default: 20000000)")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000],
+                        help="Chunk sizes to compare (default: 100000 1000000 5000000)")
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--chunk-size", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(args.input, args.chunk_size)
+        return 0
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = args.input
+        if not input_path:
+            input_path = os.path.join(temp_dir, "synthetic.laz")
+            print(f"Generating {args.points} synthetic points in {input_path}")
+            write_synthetic_laz(input_path, args.points)
+
+        results = []
+        for chunk_size in args.chunk_sizes:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--single",
+                 "--input", input_path, "--chunk-size", str(chunk_size)],
+                capture_output=True, text=True, check=True
+            )
+            results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+        print(f"input: {os.path.getsize(input_path) / (1024 * 1024):.1f} MB, {results[0]['points']} points")
+        print(f"{'chunk size':>12}{'seconds':>10}{'Mpts/s':>10}{'peak RSS MB':>14}")
+        for result in results:
+            if not result['success']:
+                print(f"{result['chunk_size']:>12}  FAILED ({result['output_points']} of "
+                      f"{result['points']} points written)")
+                continue
+            rate = result['points'] / result['seconds'] / 1e6 if result['seconds'] else 0.0
+            print(f"{result['chunk_size']:>12}{result['seconds']:>10.2f}{rate:>10.2f}{result['peak_rss_mb']:>14.1f}")
+    return 0 if all(result['success'] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,6 +23,10 @@ setup(
         "numpy",
         "lazrs",
     ],
+    extras_require={
+        "parquet": ["pyarrow"],
+        "pdal": ["pdal"],
+    },
     python_requires='>=3.7',
     entry_points={
         'console_scripts': [